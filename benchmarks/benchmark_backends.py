@@ -1,31 +1,280 @@
 """
-Lightweight script that compares execution time on Aer vs. possible real hardware.
-"""
+Benchmark harness for every circuit builder in quantumlib.
+
+Sweeps qubit counts and depths, and records build, transpile and simulation
+time, peak memory and gate/depth counts separately for each case. Results are
+written as JSON; --compare flags regressions against a saved baseline.
+
+Memory is measured apart from the timings: the peak Python allocation of build +
+transpile (tracemalloc), the simulator memory Aer reports for the experiment
+(required_memory_mb), and the peak resident set of a fresh process that builds,
+transpiles and simulates the case once, which includes Aer's native memory
+(not recorded on Windows, where neither /proc nor the resource module exists).
 
-from qiskit import Aer, execute
+    python -m benchmarks.benchmark_backends --output bench.json
+    python -m benchmarks.benchmark_backends --output new.json --compare bench.json
+"""
+import argparse
+import json
+import os
+import multiprocessing
+import platform
+import sys
 import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from math import pi
+import numpy as np
+import qiskit
+from qiskit import QuantumCircuit, transpile
+from quantumlib.execution.backend_manager import get_backend
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+TIME_METRICS = ("build_s", "transpile_s", "simulate_s")
+SIZE_METRICS = ("size", "depth", "transpile_python_peak_mb", "simulate_required_mb", "simulate_rss_increase_mb")
 
-def benchmark_circuit(circuit, backend_name="aer_simulator"):
-    from qiskit import IBMQ
-    if backend_name=="aer_simulator":
-        backend = Aer.get_backend("aer_simulator")
-    else:
-        provider=IBMQ.get_provider()
-        backend = provider.get_backend(backend_name)
-    start=time.time()
-    job=execute(circuit, backend, shots=1024)
-    result=job.result()
-    end=time.time()
-    return end-start, result.get_counts()
-
-def main():
-    print("Benchmarking a sample circuit on Aer and (optional) IBM device.")
-    # Build a small circuit
+
+def _qft(n, depth):
     from quantumlib.circuits import qft_circuit
-    qc=qft_circuit(3)
-    t_aer, cts_aer=benchmark_circuit(qc, "aer_simulator")
-    print(f"Aer time: {t_aer:.4f}s")
-    # If user wants to do IBM, they can pass the device name or put logic here.
+    return qft_circuit(n)
+
+
+def _qpe(n, depth):
+    from quantumlib.circuits import qpe_circuit
+    unitary = QuantumCircuit(1)
+    unitary.p(2*pi/3, 0)
+    return qpe_circuit(unitary, num_ancillas=max(n - 1, 1), num_target=1)
+
+
+def _grover(n, depth):
+    from quantumlib.circuits.grover import build_grover_circuit, phase_flip_oracle
+    return build_grover_circuit(n, phase_flip_oracle('1'*n), iterations=depth)
+
+
+def _annealing(n, depth):
+    from quantumlib.circuits import annealing_circuit
+    schedule = [((k + 1)/depth, 0.5) for k in range(depth)]
+    return annealing_circuit(schedule, num_qubits=max(n, 2))
+
+
+def _vqc(n, depth):
+    from quantumlib.circuits.vqc import VQC
+    vqc = VQC(num_qubits=n, num_layers=depth)
+    return vqc.bind_parameters(np.linspace(0, pi, len(vqc.params)))
+
+
+def _qaoa(n, depth):
+    from quantumlib.circuits import QAOAAnsatz
+
+    def ring(qc, gamma):
+        for q in range(n):
+            qc.rzz(gamma, q, (q + 1) % n)
+
+    return QAOAAnsatz(n, depth, ring).build(np.linspace(0.1, 1.0, 2*depth))
+
+
+def _hhl(n, depth):
+    from quantumlib.circuits import hhl_circuit
+    return hhl_circuit(4)
+
+
+# name -> (builder, uses depth, fixed qubit count)
+CASES = {
+    "qft_circuit": (_qft, False, None),
+    "qpe_circuit": (_qpe, False, None),
+    "build_grover_circuit": (_grover, True, None),
+    "annealing_circuit": (_annealing, True, None),
+    "VQC": (_vqc, True, None),
+    "QAOAAnsatz": (_qaoa, True, None),
+    "hhl_circuit": (_hhl, False, 4),
+}
+
+
+def _timed(fn, repeat):
+    best, value = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, value
+
+
+def _peak_rss_mb():
+    """Peak resident set size of this process in MiB, or None where unavailable."""
+    try:
+        # Linux: VmHWM belongs to the current address space, while ru_maxrss survives execve
+        # and would report the parent's peak in a spawned child
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KiB elsewhere
+
+
+def _memory_probe(name, num_qubits, depth, shots):
+    """Run in a fresh process: (peak RSS before the case, peak RSS after one full run)."""
+    backend = get_backend("aer_simulator")
+    warmup = QuantumCircuit(1, 1)
+    warmup.measure(0, 0)
+    backend.run(transpile(warmup, backend), shots=1).result()  # load the simulator before the baseline
+    before = _peak_rss_mb()
+    qc_t = transpile(CASES[name][0](num_qubits, depth), backend)
+    if qc_t.num_clbits == 0:
+        qc_t.measure_all()
+    backend.run(qc_t, shots=shots).result()
+    return before, _peak_rss_mb()
+
+
+def measure_simulation_memory(name, num_qubits, depth, shots=1024):
+    """
+    Peak RSS (MiB) of a fresh process running the case once, and its increase over
+    the same process right after imports. (None, None) where RSS is unavailable.
+    """
+    if _peak_rss_mb() is None:
+        return None, None
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        before, after = pool.submit(_memory_probe, name, num_qubits, depth, shots).result()
+    return after, after - before
+
+
+def benchmark_case(name, num_qubits, depth, backend, shots=1024, repeat=3, memory=True):
+    """Measure one (builder, width, depth) point; errors are recorded, not raised."""
+    builder = CASES[name][0]
+    record = {"case": name, "num_qubits": num_qubits, "depth_param": depth}
+    try:
+        record["build_s"], qc = _timed(lambda: builder(num_qubits, depth), repeat)
+        record["transpile_s"], qc_t = _timed(lambda: transpile(qc, backend), repeat)
+        if qc_t.num_clbits == 0:
+            qc_t.measure_all()
+        record["simulate_s"], result = _timed(lambda: backend.run(qc_t, shots=shots).result(), repeat)
+        required = result.results[0].metadata.get("required_memory_mb")
+        if required is not None:
+            record["simulate_required_mb"] = required
+        record["size"] = qc_t.size()
+        record["depth"] = qc_t.depth()
+        record["ops"] = dict(qc_t.count_ops())
+        # separate passes: tracemalloc would distort the timings above
+        tracemalloc.start()
+        try:
+            transpile(builder(num_qubits, depth), backend)
+            record["transpile_python_peak_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+        finally:
+            tracemalloc.stop()
+        peak, increase = measure_simulation_memory(name, num_qubits, depth, shots) if memory else (None, None)
+        if peak is not None:
+            record["simulate_peak_rss_mb"], record["simulate_rss_increase_mb"] = peak, increase
+    except Exception as exc:
+        record["error"] = f"{type(exc).__name__}: {exc}"
+    return record
+
+
+def run_suite(qubits=(2, 4, 6, 8), depths=(1, 2, 4), cases=None, shots=1024, repeat=3, memory=True):
+    """
+    Sweep every selected case over qubit counts (and depths where they apply).
+    memory=False skips the per-case subprocess that measures simulation memory.
+    """
+    backend = get_backend("aer_simulator")
+    results = []
+    for name in cases or CASES:
+        _, uses_depth, fixed_width = CASES[name]
+        widths = (fixed_width,) if fixed_width else qubits
+        for n in widths:
+            for d in (depths if uses_depth else (None,)):
+                results.append(benchmark_case(name, n, d, backend, shots, repeat, memory))
+    return {
+        "meta": {
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "qiskit": qiskit.__version__,
+            "cpu_count": os.cpu_count(),
+            "shots": shots,
+            "max_rss_mb": _peak_rss_mb(),
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, tolerance=0.25, min_seconds=1e-3):
+    """
+    Regressions of 'current' against 'baseline' (both run_suite outputs).
+
+    A timing regresses when it exceeds the baseline by more than 'tolerance'
+    (relative) and by more than 'min_seconds'; size, depth and memory regress
+    on any relative increase above 'tolerance'. New errors are regressions too.
+    """
+    key = lambda r: (r["case"], r["num_qubits"], r["depth_param"])
+    base = {key(r): r for r in baseline["results"]}
+    regressions = []
+    for rec in current["results"]:
+        old = base.get(key(rec))
+        if old is None:
+            continue
+        if "error" in rec and "error" not in old:
+            regressions.append({"key": key(rec), "metric": "error", "baseline": None, "current": rec["error"]})
+            continue
+        for metric in TIME_METRICS + SIZE_METRICS:
+            if metric not in rec or metric not in old:
+                continue
+            new_val, old_val = rec[metric], old[metric]
+            slack = min_seconds if metric in TIME_METRICS else 0.0
+            if new_val > old_val*(1 + tolerance) and new_val - old_val > slack:
+                regressions.append({"key": key(rec), "metric": metric, "baseline": old_val, "current": new_val})
+    return regressions
+
+
+def _int_list(text):
+    return tuple(int(v) for v in text.split(","))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark quantumlib circuit builders.")
+    parser.add_argument("--qubits", type=_int_list, default=(2, 4, 6, 8), help="Comma-separated qubit counts")
+    parser.add_argument("--depths", type=_int_list, default=(1, 2, 4), help="Comma-separated depths/layers")
+    parser.add_argument("--cases", type=lambda s: s.split(","), default=None,
+                        help=f"Comma-separated subset of: {', '.join(CASES)}")
+    parser.add_argument("--shots", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=3, help="Timings keep the best of N runs")
+    parser.add_argument("--output", type=str, default=None, help="Write results as JSON to this path")
+    parser.add_argument("--compare", type=str, default=None, help="Baseline JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown/growth")
+    parser.add_argument("--no-memory", dest="memory", action="store_false",
+                        help="Skip the per-case subprocess measuring simulation memory")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.qubits, args.depths, args.cases, args.shots, args.repeat, args.memory)
+    for rec in report["results"]:
+        if "error" in rec:
+            print(f"{rec['case']:>22} n={rec['num_qubits']:<3} d={rec['depth_param']}  ERROR {rec['error']}")
+        else:
+            print(f"{rec['case']:>22} n={rec['num_qubits']:<3} d={rec['depth_param']}  "
+                  f"build={rec['build_s']*1e3:8.2f}ms transpile={rec['transpile_s']*1e3:8.2f}ms "
+                  f"sim={rec['simulate_s']*1e3:8.2f}ms size={rec['size']} depth={rec['depth']}"
+                  + (f" sim_rss+={rec['simulate_rss_increase_mb']:.1f}MiB"
+                     if rec.get("simulate_rss_increase_mb") is not None else ""))
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+        regressions = compare(report, baseline, args.tolerance)
+        for reg in regressions:
+            print(f"REGRESSION {reg['key']} {reg['metric']}: {reg['baseline']} -> {reg['current']}")
+        if regressions:
+            return 1
+        print("No regressions against", args.compare)
+    return 0
+
 
-if __name__=="__main__":
-    main()
+if __name__ == "__main__":
+    sys.exit(main())
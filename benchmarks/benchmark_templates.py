@@ -0,0 +1,57 @@
+"""
+Compares the per-evaluation cost of today's bind + transpile + run path with
+the transpile-once CompiledTemplate path (single binding and batched bindings).
+"""
+import argparse
+import time
+import numpy as np
+from qiskit import transpile
+from quantumlib.circuits.vqc import VQC
+from quantumlib.execution.backend_manager import choose_backend
+from quantumlib.execution.compiled_template import clear_template_cache
+
+
+def time_evaluations(num_qubits, num_layers, evaluations, shots=1024, seed=7):
+    backend = choose_backend(ibm_priority=False)
+    vqc = VQC(num_qubits=num_qubits, num_layers=num_layers)
+    rng = np.random.default_rng(seed)
+    values = rng.uniform(0, 2*np.pi, size=(evaluations, len(vqc.params)))
+
+    start = time.perf_counter()
+    for row in values:
+        qc = vqc.bind_parameters(row)
+        qc.measure_all()
+        backend.run(transpile(qc, backend), shots=shots).result().get_counts()
+    legacy = time.perf_counter() - start
+
+    clear_template_cache()
+    start = time.perf_counter()
+    template = vqc.compile(backend)
+    for row in values:
+        template.run(row, shots=shots)
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    template.run(values, shots=shots)
+    batched = time.perf_counter() - start
+    return {
+        "bind_transpile_run": legacy / evaluations,
+        "template_bind_run": single / evaluations,
+        "template_batched": batched / evaluations,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time VQC evaluation paths (seconds per evaluation).")
+    parser.add_argument("--num_qubits", type=int, default=6)
+    parser.add_argument("--num_layers", type=int, default=4)
+    parser.add_argument("--evaluations", type=int, default=50)
+    parser.add_argument("--shots", type=int, default=1024)
+    args = parser.parse_args()
+    timings = time_evaluations(args.num_qubits, args.num_layers, args.evaluations, args.shots)
+    for name, seconds in timings.items():
+        print(f"{name:>20}: {seconds*1e3:8.2f} ms/eval")
+
+
+if __name__ == "__main__":
+    main()
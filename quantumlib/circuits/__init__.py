@@ -5,14 +5,19 @@ from .ansatz_qaoa import QAOAAnsatz
 from .ansatz_ucc import UCCAnsatz
 from .entanglement_gates import multi_controlled_cz
 from .feature_maps import ZZFeatureMap, SimpleAngleMap
-from .grover import build_grover_circuit
+from .grover import (build_grover_circuit, compile_oracle, optimal_iterations, grover_success_probability,
+                     simulate_grover)
 from .hhl import hhl_circuit
-from .qft import qft_circuit
+from .qft import qft_circuit, qft_error_bound, apply_qft
 from .qpe import qpe_circuit
-from .quantum_annealing import annealing_circuit
+from .qaoa_statevector import QAOAStatevector
+from .qaoa_landscape import LandscapeSweep, landscape_sweep
+from .quantum_annealing import annealing_circuit, ising_energies, AnnealingSimulator
 
 __all__ = [
-    "QAOAAnsatz", "UCCAnsatz", "multi_controlled_cz",
-    "ZZFeatureMap", "SimpleAngleMap", "build_grover_circuit",
-    "hhl_circuit", "qft_circuit", "qpe_circuit", "annealing_circuit"
+    "QAOAAnsatz", "QAOAStatevector", "LandscapeSweep", "landscape_sweep", "UCCAnsatz", "multi_controlled_cz",
+    "ZZFeatureMap", "SimpleAngleMap", "build_grover_circuit", "compile_oracle",
+    "optimal_iterations", "grover_success_probability", "simulate_grover",
+    "hhl_circuit", "qft_circuit", "qft_error_bound", "apply_qft", "qpe_circuit", "annealing_circuit",
+    "ising_energies", "AnnealingSimulator"
 ]
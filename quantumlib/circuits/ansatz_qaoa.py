@@ -2,6 +2,7 @@
 QAOA ansatz: alternates problem + mixer Hamiltonian for p layers.
 """
 from qiskit import QuantumCircuit
+from qiskit.circuit import ParameterVector
 from math import pi
 
 class QAOAAnsatz:
@@ -20,6 +21,12 @@ class QAOAAnsatz:
         self.p = p
         self.problem_func = problem_func
         self.mixer_func = mixer_func if mixer_func else self.default_mixer
+        # symbolic angles for the build-once parametric mode, ordered like build(params)
+        self.gammas = ParameterVector('γ', p)
+        self.betas = ParameterVector('β', p)
+        self.parameters = [angle for layer in zip(self.gammas, self.betas) for angle in layer]
+        self._parametric_circuit = None
+        self._structure_key = None
     
     def default_mixer(self, qc, beta):
         """Apply standard X mixer: e^{-i * beta * sum X_i} ~ Rx(2*beta) on each qubit"""
@@ -47,3 +54,44 @@ class QAOAAnsatz:
             # mixer layer
             self.mixer_func(qc, beta)
         return qc
+
+    def parametric_circuit(self):
+        """
+        The QAOA circuit with symbolic gammas/betas, built once and reused.
+        problem_func/mixer_func must accept qiskit Parameters as angles.
+        """
+        if self._parametric_circuit is None:
+            self._parametric_circuit = self.build(self.parameters)
+        return self._parametric_circuit
+
+    def bind(self, params):
+        """Same circuit as build(params), obtained by binding the cached parametric circuit."""
+        if len(params) != 2*self.p:
+            raise ValueError(f"Expected {2*self.p} parameters [gamma_0, beta_0, ...], got {len(params)}.")
+        return self.parametric_circuit().assign_parameters(dict(zip(self.parameters, params)))
+
+    def compile(self, backend=None, optimization_level=1, measure=True):
+        """
+        Transpile the parametric circuit once and return the cached CompiledTemplate.
+        Each evaluation afterwards only binds values into the transpiled circuit.
+        """
+        from quantumlib.execution.backend_manager import choose_backend
+        from quantumlib.execution.compiled_template import circuit_fingerprint, compile_template
+        if backend is None:
+            backend = choose_backend(ibm_priority=False)
+        circuit = self.parametric_circuit()
+        if measure:
+            circuit = circuit.copy()
+            circuit.measure_all()
+        if self._structure_key is None:
+            self._structure_key = circuit_fingerprint(self.parametric_circuit())
+        return compile_template(circuit, backend, optimization_level, parameters=self.parameters,
+                                key=self._structure_key + (measure,))
+
+    def run_batch(self, param_sets, backend=None, shots=1024, optimization_level=1):
+        """
+        Evaluate many parameter sets (array of shape (num_sets, 2*p)) as one multi-binding job.
+        Returns a list of counts dictionaries, one per parameter set.
+        """
+        template = self.compile(backend, optimization_level)
+        return template.run(param_sets, shots=shots)
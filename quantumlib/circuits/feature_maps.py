@@ -2,9 +2,58 @@
 Quantum feature maps for ML. E.g. simple angle encoding or ZZFeatureMap.
 """
 from qiskit import QuantumCircuit
+from qiskit.circuit import ParameterVector
 import numpy as np
 
-class ZZFeatureMap:
+class _BatchEncoding:
+    """
+    Batched encoding shared by the feature maps: the circuit is built once on a
+    ParameterVector and each sample only binds values into it.
+    """
+    def parametric_circuit(self):
+        """construct_circuit applied to symbolic features x[0..num_qubits-1], built once."""
+        if getattr(self, '_parametric_circuit', None) is None:
+            self.features = ParameterVector('x', self.num_qubits)
+            self._parametric_circuit = self.construct_circuit(self.features)
+        return self._parametric_circuit
+
+    def _check_batch(self, X):
+        X = np.asarray(X, dtype=float)
+        if X.ndim != 2 or X.shape[1] != self.num_qubits:
+            raise ValueError(f"X must be a 2-D array with {self.num_qubits} columns.")
+        return X
+
+    def construct_batch(self, X, chunk_size=1024):
+        """
+        Stream bound circuits for the rows of X.
+
+        X: 2-D array (num_samples, num_qubits)
+        Yields lists of at most 'chunk_size' circuits, so memory stays flat for large datasets.
+        """
+        X = self._check_batch(X)
+        template = self.parametric_circuit()
+        for start in range(0, len(X), chunk_size):
+            yield [template.assign_parameters(dict(zip(self.features, row)))
+                   for row in X[start:start + chunk_size]]
+
+    def run_batch(self, X, backend=None, shots=1024, chunk_size=1024, optimization_level=1):
+        """
+        Stream measured counts for the rows of X.
+        The template is transpiled once; every chunk is one multi-binding backend job.
+        Yields lists of counts dictionaries, one per sample.
+        """
+        from quantumlib.execution.backend_manager import choose_backend
+        from quantumlib.execution.compiled_template import compile_template
+        X = self._check_batch(X)
+        if backend is None:
+            backend = choose_backend(ibm_priority=False)
+        measured = self.parametric_circuit().copy()
+        measured.measure_all()
+        template = compile_template(measured, backend, optimization_level, parameters=self.features)
+        for start in range(0, len(X), chunk_size):
+            yield template.run(X[start:start + chunk_size], shots=shots)
+
+class ZZFeatureMap(_BatchEncoding):
     """
     A typical 2-local feature map that encodes data x in rotations and entanglement phases.
     """
@@ -27,7 +76,7 @@ class ZZFeatureMap:
                 qc.cz(i, i+1)
         return qc
 
-class SimpleAngleMap:
+class SimpleAngleMap(_BatchEncoding):
     """
     Encodes each feature as an Ry rotation, no entanglement.
     """
@@ -39,3 +88,25 @@ class SimpleAngleMap:
         for i, x in enumerate(data):
             qc.ry(x, i)
         return qc
+
+    def qubit_amplitudes(self, X):
+        """
+        Closed-form product state: Ry(x)|0> = cos(x/2)|0> + sin(x/2)|1> per qubit.
+        Returns an array of shape (num_samples, num_qubits, 2), no circuit involved.
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        if X.shape[1] > self.num_qubits:
+            raise ValueError(f"At most {self.num_qubits} features per sample.")
+        X = np.pad(X, ((0, 0), (0, self.num_qubits - X.shape[1])))
+        return np.stack([np.cos(X/2), np.sin(X/2)], axis=-1)
+
+    def amplitudes(self, X):
+        """
+        Full encoded statevectors for the rows of X, shape (num_samples, 2**num_qubits),
+        in Qiskit's little-endian ordering (qubit 0 is the least significant bit).
+        """
+        single = self.qubit_amplitudes(X)
+        amps = np.ones((len(single), 1))
+        for q in range(self.num_qubits):
+            amps = (single[:, q, :, None] * amps[:, None, :]).reshape(len(single), -1)
+        return amps
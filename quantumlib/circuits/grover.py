@@ -1,7 +1,13 @@
 """
-Construct a Grover circuit with user-specified oracle.
+Construct a Grover circuit with user-specified oracle, and analyze Grover
+searches without simulating them.
 """
+import random
+from functools import lru_cache
+from math import asin, floor, pi, sin, sqrt
+import numpy as np
 from qiskit import QuantumCircuit
+from .entanglement_gates import multi_controlled_cz
 
 def phase_flip_oracle(state_binary_str):
     """
@@ -37,10 +43,13 @@ def build_grover_circuit(num_qubits, oracle: QuantumCircuit, iterations=1):
     Args:
         num_qubits (int): Number of qubits in the circuit.
         oracle (QuantumCircuit): Circuit that flips the phase of the marked states.
-        iterations (int): Number of Grover iterations (default=1).
+        iterations (int): Number of Grover iterations (default=1). None picks
+                          optimal_iterations for oracles from compile_oracle.
     Returns:
         QuantumCircuit: Complete Grover circuit with measurements.
     """
+    if iterations is None:
+        iterations = optimal_iterations(num_qubits, (oracle.metadata or {}).get('num_marked', 1))
     qc = QuantumCircuit(num_qubits, num_qubits)
     # Initial superposition
     for q in range(num_qubits):
@@ -70,4 +79,179 @@ def diffusion(qc, n):
     for q in range(n):
         qc.x(q)
         qc.h(q)
-    qc.barrier()
\ No newline at end of file
+    qc.barrier()
+
+def _grover_angle(num_qubits, num_marked):
+    if not 0 < num_marked <= 2**num_qubits:
+        raise ValueError("num_marked must be between 1 and 2**num_qubits.")
+    return asin(sqrt(num_marked / 2**num_qubits))
+
+def optimal_iterations(num_qubits, num_marked=1):
+    """
+    Number of Grover iterations that maximizes the success probability.
+
+    Args:
+        num_qubits (int): Search register size (N = 2**num_qubits).
+        num_marked (int): Number of marked states M.
+    Returns:
+        int: floor(pi / (4 theta)) with sin(theta) = sqrt(M/N).
+    """
+    return max(0, floor(pi / (4 * _grover_angle(num_qubits, num_marked))))
+
+def grover_success_probability(num_qubits, iterations, num_marked=1):
+    """
+    Probability of measuring a marked state after 'iterations' Grover iterations.
+
+    The state stays in span{|marked>, |unmarked>}; each iteration rotates it by 2 theta,
+    so P = sin^2((2k + 1) theta).
+    """
+    theta = _grover_angle(num_qubits, num_marked)
+    return sin((2 * iterations + 1) * theta) ** 2
+
+def simulate_grover(num_qubits, marked_states, iterations=None, shots=1024, seed=None):
+    """
+    Simulate a Grover search in its two-dimensional subspace, for any num_qubits.
+
+    Args:
+        num_qubits (int): Search register size.
+        marked_states (list): Marked bitstrings (qubit 0 is the rightmost bit) or integers.
+        iterations (int): Grover iterations; None picks optimal_iterations.
+        shots (int): Number of sampled measurements (0 skips sampling).
+        seed (int): Seed for sampling.
+    Returns:
+        dict: 'iterations', 'success_probability' and sampled 'counts' keyed by bitstring.
+    """
+    marked = sorted({int(m, 2) if isinstance(m, str) else int(m) for m in marked_states})
+    if any(m < 0 or m >= 2**num_qubits for m in marked):
+        raise ValueError("Marked states must fit in num_qubits bits.")
+    if iterations is None:
+        iterations = optimal_iterations(num_qubits, len(marked))
+    p_success = grover_success_probability(num_qubits, iterations, len(marked))
+
+    rng = np.random.default_rng(seed)
+    counts = {}
+    if shots:
+        hits = rng.binomial(shots, p_success)
+        for state, c in zip(marked, rng.multinomial(hits, [1 / len(marked)] * len(marked))):
+            if c:
+                counts[format(state, f'0{num_qubits}b')] = int(c)
+        # unmarked amplitudes are uniform: rejection-sample among the other N - M states
+        marked_set = set(marked)
+        draw = random.Random(int(rng.integers(2**32)))
+        for _ in range(shots - hits):
+            while True:
+                state = draw.getrandbits(num_qubits)
+                if state not in marked_set:
+                    break
+            key = format(state, f'0{num_qubits}b')
+            counts[key] = counts.get(key, 0) + 1
+    return {'iterations': iterations, 'success_probability': p_success, 'counts': counts}
+
+def _formula_marked(num_qubits, clauses, form):
+    """States satisfying a CNF/DNF formula, evaluated for all 2**num_qubits states at once."""
+    states = np.arange(2**num_qubits)
+    def literal(lit):
+        q = abs(lit) - 1
+        if not 0 <= q < num_qubits:
+            raise ValueError(f"Literal {lit} refers to a qubit outside 0..{num_qubits - 1}.")
+        bit = (states >> q) & 1
+        return bit == 1 if lit > 0 else bit == 0
+    if form == 'cnf':
+        truth = np.ones(len(states), dtype=bool)
+        for clause in clauses:
+            truth &= np.logical_or.reduce([literal(l) for l in clause])
+    else:
+        truth = np.zeros(len(states), dtype=bool)
+        for term in clauses:
+            truth |= np.logical_and.reduce([literal(l) for l in term])
+    return frozenset(int(s) for s in np.flatnonzero(truth))
+
+def _disjoint_cubes(marked, num_qubits):
+    """
+    Merge marked states into disjoint cubes (dont_care_mask, value).
+
+    Two cubes with the same don't-care mask that differ in one cared-for bit are
+    merged; since the cubes always partition the marked set, every marked state
+    is phase-flipped exactly once.
+    """
+    cubes = {(0, m) for m in marked}
+    merged = True
+    while merged:
+        merged = False
+        result = set()
+        used = set()
+        for mask, value in sorted(cubes):
+            if (mask, value) in used:
+                continue
+            for q in range(num_qubits):
+                bit = 1 << q
+                partner = (mask, value ^ bit)
+                if not mask & bit and partner in cubes and partner not in used:
+                    used.update({(mask, value), partner})
+                    result.add((mask | bit, value & ~bit))
+                    merged = True
+                    break
+            else:
+                used.add((mask, value))
+                result.add((mask, value))
+        cubes = result
+    return sorted(cubes)
+
+@lru_cache(maxsize=128)
+def _compile_marked(num_qubits, marked):
+    qc = QuantumCircuit(num_qubits, name="oracle")
+    flipped = [False] * num_qubits
+    for mask, value in _disjoint_cubes(marked, num_qubits):
+        literals = [q for q in range(num_qubits) if not (mask >> q) & 1]
+        # controls shared between cubes keep their X conjugation instead of undoing it
+        for q in literals:
+            needs_flip = not (value >> q) & 1
+            if flipped[q] != needs_flip:
+                qc.x(q)
+                flipped[q] = needs_flip
+        if not literals:
+            qc.global_phase += pi
+        elif len(literals) == 1:
+            qc.z(literals[0])
+        else:
+            multi_controlled_cz(qc, literals[:-1], literals[-1])
+    for q in range(num_qubits):
+        if flipped[q]:
+            qc.x(q)
+    qc.metadata = {'num_marked': len(marked)}
+    return qc
+
+def compile_oracle(num_qubits, marked_states=None, cnf=None, dnf=None):
+    """
+    Compile a minimized phase oracle for a set of marked states or a boolean formula.
+
+    Marked states are merged into disjoint cubes, so each group of states that
+    differs only in some qubits costs one multi-controlled Z on the remaining
+    qubits, and X gates are shared between consecutive cubes. Results are
+    cached by marking specification: treat the returned circuit as read-only.
+
+    Args:
+        num_qubits (int): Number of qubits.
+        marked_states (iterable): Bitstrings (qubit 0 is the rightmost bit) or integers.
+        cnf (list): Clauses of DIMACS-style literals: k means qubit k-1 is 1, -k means it is 0.
+        dnf (list): Terms of DIMACS-style literals.
+    Returns:
+        QuantumCircuit: Phase oracle; metadata['num_marked'] holds the number of marked states.
+    """
+    if sum(spec is not None for spec in (marked_states, cnf, dnf)) != 1:
+        raise ValueError("Give exactly one of marked_states, cnf or dnf.")
+    if marked_states is not None:
+        marked = frozenset(int(m, 2) if isinstance(m, str) else int(m) for m in marked_states)
+        if any(m < 0 or m >= 2**num_qubits for m in marked):
+            raise ValueError("Marked states must fit in num_qubits bits.")
+    else:
+        form = 'cnf' if cnf is not None else 'dnf'
+        clauses = tuple(tuple(clause) for clause in (cnf if cnf is not None else dnf))
+        marked = _cached_formula_marked(num_qubits, clauses, form)
+    if not marked:
+        raise ValueError("The oracle does not mark any state.")
+    return _compile_marked(num_qubits, marked)
+
+@lru_cache(maxsize=128)
+def _cached_formula_marked(num_qubits, clauses, form):
+    return _formula_marked(num_qubits, clauses, form)
@@ -0,0 +1,163 @@
+"""
+Parallel QAOA landscape sweeps over (gamma, beta) grids.
+
+The grid is the Cartesian product of one axis per parameter, in QAOAAnsatz order
+[gamma_0, beta_0, ...]. It is split into chunks of flat grid indices that are
+evaluated with QAOAStatevector across a process pool. Results stream into a
+memory-mapped .npy file together with a per-chunk done mask, so an interrupted
+sweep resumes where it stopped.
+"""
+import hashlib
+import heapq
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from .qaoa_statevector import QAOAStatevector
+
+# per-worker state, set once by _init_worker
+_WORKER = {}
+
+def _init_worker(cost, axes):
+    _WORKER["evaluator"] = QAOAStatevector(cost)
+    _WORKER["axes"] = axes
+
+def _grid_points(axes, start, stop):
+    shape = tuple(len(ax) for ax in axes)
+    idx = np.unravel_index(np.arange(start, stop), shape)
+    return np.stack([ax[i] for ax, i in zip(axes, idx)], axis=1)
+
+def _evaluate_chunk(start, stop):
+    points = _grid_points(_WORKER["axes"], start, stop)
+    return start, _WORKER["evaluator"].expectation(points)
+
+class LandscapeSweep:
+    """
+    Resumable sweep of <C> over a parameter grid.
+
+    Files written next to 'path' (a .npy file):
+      path              float64 memmap of the grid shape, NaN until evaluated
+      path.done.npy     bool per chunk
+      path.meta.json    grid/cost fingerprint, checked before resuming
+    """
+    def __init__(self, cost, axes, path, chunk_size=4096, max_workers=None, top_k=10):
+        """
+        cost: diagonal cost vector (see QAOAStatevector)
+        axes: list of 1-D arrays, one per parameter [gamma_0, beta_0, ...]
+        path: .npy file for the results
+        chunk_size: grid points per task
+        max_workers: process pool size; 0 evaluates in this process
+        top_k: number of best (lowest <C>) points tracked
+        """
+        self.cost = np.asarray(cost, dtype=float)
+        self.axes = [np.asarray(ax, dtype=float) for ax in axes]
+        if len(self.axes) % 2:
+            raise ValueError("Expected one axis per parameter [gamma_0, beta_0, ...].")
+        self.shape = tuple(len(ax) for ax in self.axes)
+        self.size = int(np.prod(self.shape))
+        self.path = os.fspath(path)
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.top_k = top_k
+        self.num_chunks = -(-self.size // chunk_size)
+        self.values, self.done = self._open()
+        self._best = []
+        self._update_best(0, self.size, only_done=True)
+
+    def _fingerprint(self):
+        digest = hashlib.sha1(self.cost.tobytes())
+        for ax in self.axes:
+            digest.update(ax.tobytes())
+        return {"shape": list(self.shape), "chunk_size": self.chunk_size, "sha1": digest.hexdigest()}
+
+    def _open(self):
+        meta_path, done_path = self.path + ".meta.json", self.path + ".done.npy"
+        meta = self._fingerprint()
+        if os.path.exists(self.path) and os.path.exists(meta_path) and os.path.exists(done_path):
+            with open(meta_path) as f:
+                if json.load(f) != meta:
+                    raise ValueError(f"{self.path} holds a different sweep; remove it or choose another path.")
+            return (np.lib.format.open_memmap(self.path, mode="r+"),
+                    np.lib.format.open_memmap(done_path, mode="r+"))
+        values = np.lib.format.open_memmap(self.path, mode="w+", dtype=float, shape=self.shape)
+        values[...] = np.nan
+        done = np.lib.format.open_memmap(done_path, mode="w+", dtype=bool, shape=(self.num_chunks,))
+        with open(meta_path, "w") as f:
+            json.dump(meta, f)
+        return values, done
+
+    def _chunk_bounds(self, chunk):
+        start = chunk * self.chunk_size
+        return start, min(start + self.chunk_size, self.size)
+
+    def _update_best(self, start, stop, only_done=False):
+        flat = self.values.reshape(-1)
+        for chunk in range(start // self.chunk_size, -(-stop // self.chunk_size)):
+            if only_done and not self.done[chunk]:
+                continue
+            lo, hi = self._chunk_bounds(chunk)
+            block = flat[lo:hi]
+            k = min(self.top_k, len(block))
+            for i in np.argpartition(block, k - 1)[:k]:
+                item = (-float(block[i]), lo + int(i))
+                if len(self._best) < self.top_k:
+                    heapq.heappush(self._best, item)
+                else:
+                    heapq.heappushpop(self._best, item)
+
+    def best(self):
+        """Best points found so far as a list of (value, params), lowest <C> first."""
+        ranked = sorted(self._best, reverse=True)
+        return [(-neg, _grid_points(self.axes, i, i + 1)[0]) for neg, i in ranked]
+
+    @property
+    def complete(self):
+        return bool(self.done.all())
+
+    def _store(self, start, values):
+        self.values.reshape(-1)[start:start + len(values)] = values
+        # values must be on disk before the chunk is marked done, or a crash could
+        # leave a done flag pointing at values that were never written
+        self.values.flush()
+        self.done[start // self.chunk_size] = True
+        self.done.flush()
+        self._update_best(start, start + len(values))
+
+    def run(self, callback=None):
+        """
+        Evaluate every chunk not yet done.
+
+        callback(done_chunks, num_chunks, best) is called after each chunk,
+        with best as returned by best().
+        Returns best() once the sweep is complete.
+        """
+        pending = [c for c in range(self.num_chunks) if not self.done[c]]
+        finished = self.num_chunks - len(pending)
+
+        def report(start, values):
+            nonlocal finished
+            self._store(start, values)
+            finished += 1
+            if callback is not None:
+                callback(finished, self.num_chunks, self.best())
+
+        if self.max_workers == 0:
+            _init_worker(self.cost, self.axes)
+            for chunk in pending:
+                report(*_evaluate_chunk(*self._chunk_bounds(chunk)))
+        elif pending:
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                     initargs=(self.cost, self.axes)) as pool:
+                futures = [pool.submit(_evaluate_chunk, *self._chunk_bounds(c)) for c in pending]
+                for future in as_completed(futures):
+                    report(*future.result())
+        return self.best()
+
+def landscape_sweep(cost, axes, path, chunk_size=4096, max_workers=None, top_k=10, callback=None):
+    """
+    Run (or resume) a LandscapeSweep and return (values memmap, best points).
+    See LandscapeSweep for the arguments.
+    """
+    sweep = LandscapeSweep(cost, axes, path, chunk_size, max_workers, top_k)
+    best = sweep.run(callback)
+    return sweep.values, best
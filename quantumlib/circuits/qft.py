@@ -1,44 +1,104 @@
 from qiskit import QuantumCircuit
-from qiskit.circuit.library import QFT
-from math import pi
+from math import pi, sin
+import numpy as np
 
-def qft_circuit(num_qubits, do_swap=True):
+def qft_circuit(num_qubits, do_swap=True, approximation_degree=0):
     """
-    Build a Quantum Fourier Transform circuit for num_qubits.
+    Build a (possibly approximate) Quantum Fourier Transform circuit for num_qubits.
+
+    With do_swap=True the circuit maps |x> to 1/sqrt(N) sum_y exp(2 pi i x y / N) |y>
+    in Qiskit's little-endian ordering.
 
     Args:
         num_qubits (int): Number of qubits, must be positive.
         do_swap (bool): Whether to include final swap gates for bit order (default=True).
+        approximation_degree (int): Drop controlled-phase gates between qubits more than
+            num_qubits - 1 - approximation_degree apart, i.e. every rotation smaller than
+            pi / 2**(num_qubits - 1 - approximation_degree). 0 gives the exact QFT.
+            The operator-norm error is at most qft_error_bound(num_qubits, approximation_degree).
 
     Returns:
         QuantumCircuit: QFT circuit, optionally with swaps for little-endian output.
 
     Raises:
-        ValueError: If num_qubits is not positive.
+        ValueError: If num_qubits is not positive or approximation_degree is negative.
     """
     if num_qubits <= 0:
         raise ValueError("Number of qubits must be positive.")
-    
-    # For large circuits, suggest using Qiskit's optimized QFT
-    if num_qubits > 10:
-        print("Warning: For num_qubits > 10, consider using Qiskit’s QFT for optimized gate decomposition.")
-        return QFT(num_qubits, approximation_degree=0, do_swaps=do_swap).to_circuit()
-    
+    if approximation_degree < 0:
+        raise ValueError("approximation_degree must be non-negative.")
+    max_distance = num_qubits - 1 - approximation_degree
+
     qc = QuantumCircuit(num_qubits, name="QFT")
-    
-    # Step 1: Apply Hadamard to each qubit for initial superposition
-    for i in range(num_qubits):
-        qc.h(i)
-    
-    # Step 2: Apply controlled phase gates for each pair (j > i)
-    for i in range(num_qubits):
-        for j in range(i + 1, num_qubits):
-            angle = pi / (2 ** (j - i))
-            qc.cp(angle, j, i)  # Control on j, target on i
-    
-    # Step 3: Optional swap to adjust bit order (little-endian to big-endian)
+
+    # Hadamard on each qubit (most significant first), followed by the controlled
+    # phases from all less significant qubits that are within max_distance
+    for j in reversed(range(num_qubits)):
+        qc.h(j)
+        for k in reversed(range(max(0, j - max_distance), j)):
+            qc.cp(pi / (2 ** (j - k)), j, k)
+
+    # Optional swap to adjust bit order
     if do_swap:
         for i in range(num_qubits // 2):
             qc.swap(i, num_qubits - i - 1)
-    
-    return qc
\ No newline at end of file
+
+    return qc
+
+def qft_error_bound(num_qubits, approximation_degree):
+    """
+    Upper bound on ||QFT - AQFT|| (operator norm) for qft_circuit's approximation.
+
+    Each dropped controlled phase of angle theta differs from the identity by
+    |exp(i theta) - 1| = 2 sin(theta / 2). There are num_qubits - d pairs at
+    distance d, each with angle pi / 2**d, so the bound is
+    sum_{d > num_qubits - 1 - approximation_degree} (num_qubits - d) 2 sin(pi / 2**(d+1)),
+    which is below num_qubits * pi / 2**(num_qubits - 1 - approximation_degree).
+    """
+    max_distance = num_qubits - 1 - approximation_degree
+    return sum((num_qubits - d) * 2 * sin(pi / 2 ** (d + 1))
+               for d in range(max(1, max_distance + 1), num_qubits))
+
+def _bit_reversal(num_bits):
+    idx = np.arange(2 ** num_bits)
+    rev = np.zeros_like(idx)
+    for b in range(num_bits):
+        rev |= ((idx >> b) & 1) << (num_bits - 1 - b)
+    return rev
+
+def apply_qft(state, qubits=None, inverse=False, do_swap=True):
+    """
+    Apply the exact (inverse) QFT to a statevector with a NumPy FFT in O(n 2^n).
+
+    Equivalent to evolving 'state' through qft_circuit(len(qubits), do_swap)
+    (or its inverse) on 'qubits', without gate-by-gate simulation.
+
+    Args:
+        state (array-like or Statevector): Statevector of n qubits.
+        qubits (list): Qubits the QFT acts on, least significant first
+                       (default: all qubits, e.g. range(num_ancillas) for QPE readout).
+        inverse (bool): Apply the inverse QFT.
+        do_swap (bool): Match qft_circuit's do_swap option.
+
+    Returns:
+        np.ndarray: The transformed statevector.
+    """
+    psi = np.asarray(getattr(state, 'data', state), dtype=complex)
+    n = int(round(np.log2(len(psi))))
+    if 2 ** n != len(psi):
+        raise ValueError("State length must be a power of two.")
+    qubits = list(range(n)) if qubits is None else list(qubits)
+    k = len(qubits)
+
+    # axis a of the (2,)*n tensor is qubit n-1-a; put the register last, most significant first
+    axes = [n - 1 - q for q in reversed(qubits)]
+    tensor = np.moveaxis(psi.reshape((2,) * n), axes, range(n - k, n))
+    block = tensor.reshape(-1, 2 ** k)
+    size = np.sqrt(2 ** k)
+    if not do_swap and inverse:
+        block = block[:, _bit_reversal(k)]
+    block = np.fft.fft(block, axis=1) / size if inverse else np.fft.ifft(block, axis=1) * size
+    if not do_swap and not inverse:
+        block = block[:, _bit_reversal(k)]
+    tensor = np.moveaxis(block.reshape(tensor.shape), range(n - k, n), axes)
+    return tensor.reshape(-1)
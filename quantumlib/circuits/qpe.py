@@ -1,16 +1,83 @@
 """
 Quantum Phase Estimation
 """
+import hashlib
+from collections import OrderedDict
+import numpy as np
 from qiskit import QuantumCircuit
-from qiskit.circuit.library import QFT
+from qiskit.circuit.library import UnitaryGate
+from qiskit.quantum_info import Operator
+from .qft import qft_circuit
+
+# Largest target register for which U is turned into a matrix and squared
+MAX_MATRIX_QUBITS = 10
+
+_CONTROLLED_POWER_CACHE = OrderedDict()
+_CONTROLLED_POWER_CACHE_SIZE = 256
+
+def unitary_fingerprint(matrix):
+    """Stable hash of a unitary matrix (rounded to 12 decimals)."""
+    matrix = np.round(np.asarray(matrix, dtype=complex), 12) + 0.0  # + 0.0 folds -0.0 into 0.0
+    return hashlib.sha1(str(matrix.shape).encode() + matrix.tobytes()).hexdigest()
+
+def _nearest_unitary(matrix):
+    # polar projection keeps repeated squaring from drifting away from unitarity
+    u, _, vh = np.linalg.svd(matrix)
+    return u @ vh
+
+def controlled_power(matrix, power, fingerprint=None):
+    """
+    Controlled U^power as a single gate, cached by (unitary fingerprint, power).
+
+    Args:
+        matrix (np.ndarray): Unitary U.
+        power (int): Exponent, typically 2**a for ancilla a.
+        fingerprint (str): Precomputed unitary_fingerprint(matrix).
+    Returns:
+        ControlledGate: One-qubit-controlled U^power.
+    """
+    key = (fingerprint or unitary_fingerprint(matrix), power)
+    gate = _CONTROLLED_POWER_CACHE.get(key)
+    if gate is None:
+        result = np.eye(len(matrix), dtype=complex)
+        base = np.asarray(matrix, dtype=complex)
+        exponent = power
+        while exponent:
+            if exponent & 1:
+                result = _nearest_unitary(result @ base)
+            exponent >>= 1
+            if exponent:
+                base = _nearest_unitary(base @ base)
+        gate = UnitaryGate(result, label=f"U^{power}").control(1)
+        _CONTROLLED_POWER_CACHE[key] = gate
+        if len(_CONTROLLED_POWER_CACHE) > _CONTROLLED_POWER_CACHE_SIZE:
+            _CONTROLLED_POWER_CACHE.popitem(last=False)
+    else:
+        _CONTROLLED_POWER_CACHE.move_to_end(key)
+    return gate
+
+def _unitary_matrix(unitary, num_target):
+    if isinstance(unitary, np.ndarray):
+        return unitary
+    if num_target > MAX_MATRIX_QUBITS:
+        return None
+    try:
+        return Operator(unitary).data
+    except Exception:
+        return None
 
 def qpe_circuit(unitary, num_ancillas, num_target):
     """
-    Build QPE circuit using 'unitary' on 'num_target' qubits, 
+    Build QPE circuit using 'unitary' on 'num_target' qubits,
     with 'num_ancillas' qubits for phase readout.
 
+    When U is a matrix or a circuit/gate on at most MAX_MATRIX_QUBITS qubits,
+    each U^(2^a) is computed once by repeated squaring and applied as a single
+    cached controlled gate, so the circuit grows linearly in num_ancillas.
+    Larger operators fall back to 2^a repeated controlled-U applications.
+
     Args:
-        unitary: QuantumCircuit or Gate representing the unitary operator.
+        unitary: QuantumCircuit, Gate or unitary matrix (np.ndarray) representing the unitary operator.
         num_ancillas (int): Number of ancilla qubits for phase estimation.
         num_target (int): Number of target qubits for the unitary.
     Returns:
@@ -21,29 +88,37 @@ def qpe_circuit(unitary, num_ancillas, num_target):
         raise ValueError("num_ancillas and num_target must be positive integers.")
     if isinstance(unitary, QuantumCircuit) and unitary.num_qubits != num_target:
         raise ValueError(f"Unitary must act on {num_target} qubits.")
+    if isinstance(unitary, np.ndarray) and unitary.shape != (2**num_target, 2**num_target):
+        raise ValueError(f"Unitary matrix must be {2**num_target}x{2**num_target}.")
 
     # Initialize circuit
     qc = QuantumCircuit(num_ancillas + num_target, num_ancillas)
-    
+    targets = list(range(num_ancillas, num_ancillas + num_target))
+
     # Step 1: Hadamard on ancillas
     qc.h(range(num_ancillas))
-    
+
     # Step 2: Controlled unitary applications
-    if isinstance(unitary, QuantumCircuit):
-        unitary_gate = unitary.to_gate()
+    matrix = _unitary_matrix(unitary, num_target)
+    if matrix is not None:
+        fingerprint = unitary_fingerprint(matrix)
+        for a in range(num_ancillas):
+            qc.append(controlled_power(matrix, 2**a, fingerprint), [a] + targets)
     else:
-        unitary_gate = unitary
-    controlled_unitary = unitary_gate.control(1)
-    
-    for a in range(num_ancillas):
-        reps = 2**a
-        for _ in range(reps):
-            qc.append(controlled_unitary, [a] + list(range(num_ancillas, num_ancillas + num_target)))
-    
+        if isinstance(unitary, QuantumCircuit):
+            unitary_gate = unitary.to_gate()
+        else:
+            unitary_gate = unitary
+        controlled_unitary = unitary_gate.control(1)
+        for a in range(num_ancillas):
+            reps = 2**a
+            for _ in range(reps):
+                qc.append(controlled_unitary, [a] + targets)
+
     # Step 3: Inverse QFT on ancillas
-    qc.append(QFT(num_ancillas, inverse=True), range(num_ancillas))
-    
+    qc.append(qft_circuit(num_ancillas).inverse().to_gate(label="IQFT"), range(num_ancillas))
+
     # Step 4: Measure ancillas
     qc.measure(range(num_ancillas), range(num_ancillas))
-    
-    return qc
\ No newline at end of file
+
+    return qc
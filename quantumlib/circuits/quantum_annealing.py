@@ -1,35 +1,70 @@
 # quantum_annealing.py
 
+import numpy as np
 from qiskit import QuantumCircuit
 
-def annealing_circuit(schedule_params, num_qubits=2):
+def _ising_terms(num_qubits, h, J):
+    """Normalize (h, J): default is the unit-coupling nearest-neighbour chain with no fields."""
+    if J is None:
+        J = [(q, q + 1, 1.0) for q in range(num_qubits - 1)]
+    edges = []
+    for i, j, coupling in J:
+        if not (0 <= i < num_qubits and 0 <= j < num_qubits) or i == j:
+            raise ValueError(f"Invalid coupling ({i}, {j}) for {num_qubits} qubits.")
+        edges.append((int(i), int(j), float(coupling)))
+    h = np.zeros(num_qubits) if h is None else np.asarray(h, dtype=float)
+    if h.shape != (num_qubits,):
+        raise ValueError(f"h must have length {num_qubits}.")
+    return h, edges
+
+def _merged_problem_angles(schedule_params):
+    """
+    Angles of the problem layers once consecutive layers are merged.
+
+    Step k applies P(a_k) M_k P(a_k) with a_k = s_k dt_k. Problem layers are diagonal
+    and commute, so P(a_k) P(a_{k+1}) = P(a_k + a_{k+1}): K steps need K + 1 problem layers.
+    Returns (problem_angles, mixer_angles) with problem_angles[k] applied before mixer k.
+    """
+    problem = [s * dt for s, dt in schedule_params]
+    mixer = [(1 - s) * dt for s, dt in schedule_params]
+    merged = [a + b for a, b in zip([0.0] + problem, problem + [0.0])]
+    return merged, mixer
+
+def annealing_circuit(schedule_params, num_qubits=2, h=None, J=None):
     """
     Construct a Trotterized quantum annealing circuit.
 
     Args:
-        schedule_params (list of tuples): 
+        schedule_params (list of tuples):
             Each tuple is (s, dt), where s in [0,1] is the annealing parameter,
             and dt is the time step for that segment.
-        num_qubits (int): 
+        num_qubits (int):
             Number of qubits in the circuit (>= 2).
+        h (array-like):
+            Local fields h_i of the Ising problem (default: all zero).
+        J (list of tuples):
+            Sparse couplings (i, j, J_ij) (default: J_ij = 1 on the nearest-neighbour chain).
 
     Returns:
         QuantumCircuit: The constructed quantum circuit implementing one pass
                         of the annealing schedule.
 
     Notes:
-    - This version uses the convention H_m = sum_k X_k, consistent with 
-      Qiskit's QAOA approach. That means the mixer gates have a *positive* angle 
+    - This version uses the convention H_m = sum_k X_k, consistent with
+      Qiskit's QAOA approach. That means the mixer gates have a *positive* angle
       (rx(2 * theta_m)).
-    - If you want H_m = -sum_k X_k instead, just change the mixer gate to 
+    - If you want H_m = -sum_k X_k instead, just change the mixer gate to
       rx(-2 * theta_m).
     - The code also includes initial state preparation with Hadamards, which is
-      common in QAOA-like approaches (|+> initial state). 
-    - For multi-qubit systems (num_qubits > 2), it applies rzz gates to each pair 
-      of adjacent qubits (a simple "chain" problem Hamiltonian).
+      common in QAOA-like approaches (|+> initial state).
+    - The problem Hamiltonian is H_p = sum J_ij Z_i Z_j + sum h_i Z_i; a problem layer
+      of angle a applies rzz(a J_ij) and rz(a h_i), i.e. exp(-i a H_p / 2).
+    - Each schedule step is P(s dt) M P(s dt); the problem layers of consecutive
+      steps are merged, so K steps emit K + 1 problem layers instead of 2K.
     """
     if num_qubits < 2:
         raise ValueError("The number of qubits must be at least 2.")
+    h, edges = _ising_terms(num_qubits, h, J)
 
     # Create a quantum circuit with the specified number of qubits
     qc = QuantumCircuit(num_qubits)
@@ -38,21 +73,95 @@ def annealing_circuit(schedule_params, num_qubits=2):
     # for a uniform superposition (common in many QAOA-style algorithms).
     qc.h(range(num_qubits))
 
-    # Loop over each (s, dt) pair in the schedule
-    for s, dt in schedule_params:
-        # The fraction of the time devoted to the mixer
-        theta_m = (1 - s) * dt
-
-        # First half-step of the problem Hamiltonian (H_p = sum of ZZ interactions on adjacent qubits)
-        for qubit in range(num_qubits - 1):
-            qc.rzz(s * dt, qubit, qubit + 1)
+    problem_angles, mixer_angles = _merged_problem_angles(schedule_params)
+    for k, angle in enumerate(problem_angles):
+        # Problem Hamiltonian layer (merged with the previous step's second half)
+        if angle:
+            for i, j, coupling in edges:
+                qc.rzz(angle * coupling, i, j)
+            for i in range(num_qubits):
+                if h[i]:
+                    qc.rz(angle * h[i], i)
 
         # Apply the mixer Hamiltonian: H_m = sum_k X_k, so e^{-i (1-s) X_k dt} => rx(2 * theta_m, k)
-        for k in range(num_qubits):
-            qc.rx(2 * theta_m, k)
+        if k < len(mixer_angles):
+            for q in range(num_qubits):
+                qc.rx(2 * mixer_angles[k], q)
+
+    return qc
+
+def ising_energies(num_qubits, h=None, J=None):
+    """
+    Diagonal of H_p = sum J_ij Z_i Z_j + sum h_i Z_i over all 2**num_qubits basis states
+    (Qiskit ordering: bit q of the index is qubit q, Z eigenvalue +1 for 0 and -1 for 1).
+    """
+    h, edges = _ising_terms(num_qubits, h, J)
+    idx = np.arange(2 ** num_qubits)
+    z = 1 - 2 * ((idx[None, :] >> np.arange(num_qubits)[:, None]) & 1)
+    energies = h @ z.astype(float)
+    for i, j, coupling in edges:
+        energies += coupling * z[i] * z[j]
+    return energies
+
+def apply_mixer(psi, theta):
+    """
+    Apply rx(2 theta) = exp(-i theta X) to every qubit of a batch of statevectors, in place.
+
+    psi: complex array of shape (batch, 2**n), theta: array of shape (batch,).
+    Each qubit is one butterfly pass over pairs of amplitudes that differ in that bit.
+    """
+    c = np.cos(theta)[:, None, None]
+    isin = -1j * np.sin(theta)[:, None, None]
+    batch, dim = psi.shape
+    num_qubits = dim.bit_length() - 1
+    for q in range(num_qubits):
+        view = psi.reshape(batch, -1, 2, 2 ** q)
+        a, b = view[:, :, 0, :], view[:, :, 1, :]
+        a_old = a.copy()
+        a *= c
+        a += isin * b
+        b *= c
+        b += isin * a_old
+    return psi
+
+class AnnealingSimulator:
+    """
+    Statevector simulator for annealing_circuit.
+
+    The problem Hamiltonian is precomputed once as a diagonal, so each problem
+    layer is one elementwise phase multiply; the mixer is applied as per-qubit
+    rotations. Schedules of equal length are simulated together as a batch.
+    """
+    def __init__(self, num_qubits, h=None, J=None):
+        self.num_qubits = num_qubits
+        self.energies = ising_energies(num_qubits, h, J)
+
+    def run_batch(self, schedules):
+        """
+        schedules: array of shape (num_schedules, num_steps, 2) holding (s, dt) pairs
+        returns statevectors of shape (num_schedules, 2**num_qubits)
+        """
+        schedules = np.asarray(schedules, dtype=float)
+        if schedules.ndim != 3 or schedules.shape[2] != 2:
+            raise ValueError("schedules must have shape (num_schedules, num_steps, 2).")
+        batch, dim = len(schedules), 2 ** self.num_qubits
+        s, dt = schedules[..., 0], schedules[..., 1]
+        problem = s * dt
+        merged = np.concatenate([problem, np.zeros((batch, 1))], axis=1)
+        merged[:, 1:] += problem
+        mixer = (1 - s) * dt
+
+        psi = np.full((batch, dim), 1 / np.sqrt(dim), dtype=complex)
+        for k in range(merged.shape[1]):
+            psi *= np.exp(-0.5j * merged[:, k, None] * self.energies[None, :])
+            if k < mixer.shape[1]:
+                apply_mixer(psi, mixer[:, k])
+        return psi
 
-        # Second half-step of the problem Hamiltonian
-        for qubit in range(num_qubits - 1):
-            qc.rzz(s * dt, qubit, qubit + 1)
+    def statevector(self, schedule_params):
+        """Final statevector for one schedule (list of (s, dt) pairs)."""
+        return self.run_batch(np.asarray(schedule_params, dtype=float)[None])[0]
 
-    return qc
\ No newline at end of file
+    def expectation(self, states):
+        """<H_p> for one statevector or a batch of them."""
+        return np.abs(states) ** 2 @ self.energies
@@ -1,6 +1,12 @@
-from qiskit import QuantumCircuit
+from qiskit import QuantumCircuit, transpile
 from qiskit.circuit import ParameterVector
-from typing import Union
+from typing import Callable, Optional, Union
+import numpy as np
+
+def parity_expectation(counts: dict) -> float:
+    """Expectation value of Z⊗...⊗Z estimated from a counts dictionary."""
+    total = sum(counts.values())
+    return sum((-1) ** key.replace(' ', '').count('1') * c for key, c in counts.items()) / total
 
 class VQC:
     """Variational Quantum Circuit with customizable rotations and entanglement."""
@@ -34,8 +40,11 @@ class VQC:
         # Build the quantum circuit
         self.circuit = QuantumCircuit(num_qubits)
         param_index = 0
+        # instruction index at which each rotation layer starts (used for layer-prefix circuits)
+        self.layer_starts = []
         
         for layer in range(num_layers):
+            self.layer_starts.append(len(self.circuit.data))
             # Rotation layer
             for q in range(num_qubits):
                 if self.rotation_gate == 'RY':
@@ -70,4 +79,143 @@ class VQC:
             raise ValueError("Parameter list length must equal number of circuit parameters.")
         bound_circuit = self.circuit.assign_parameters({self.params[i]: val 
                                                        for i, val in enumerate(param_values)})
-        return bound_circuit
\ No newline at end of file
+        return bound_circuit
+
+    def structure_key(self) -> tuple:
+        """Hashable description of the circuit structure (independent of parameter values)."""
+        pattern = self.entanglement_pattern
+        if isinstance(pattern, list):
+            pattern = tuple(tuple(pair) for pair in pattern)
+        return ('VQC', self.num_qubits, self.num_layers, self.rotation_gate, pattern,
+                self.entanglement_in_last_layer)
+
+    def compile(self, backend=None, optimization_level: int = 1, measure: bool = True):
+        """
+        Transpile the parametric circuit once and return a cached CompiledTemplate.
+
+        The template binds new values directly into the transpiled circuit
+        (template.bind / template.run accept a 2-D array of bindings), so training
+        loops skip the per-evaluation transpile.
+
+        Args:
+            backend: Target backend. Defaults to choose_backend(ibm_priority=False).
+            optimization_level (int): Transpiler optimization level.
+            measure (bool): Whether to append measure_all before transpiling.
+
+        Returns:
+            CompiledTemplate: Cached per (structure, backend, optimization level).
+        """
+        from quantumlib.execution.backend_manager import choose_backend
+        from quantumlib.execution.compiled_template import compile_template
+        if backend is None:
+            backend = choose_backend(ibm_priority=False)
+        circuit = self.circuit
+        if measure:
+            circuit = circuit.copy()
+            circuit.measure_all()
+        return compile_template(circuit, backend, optimization_level, parameters=self.params,
+                                key=self.structure_key() + (measure,))
+
+    def parameter_shift_gradient(self, param_values, backend=None, observable: Optional[Callable] = None,
+                                 shots: int = 1024) -> np.ndarray:
+        """
+        Exact-in-expectation gradient via the parameter-shift rule.
+
+        Every parameter drives exactly one Pauli rotation, so
+        d<O>/dθ_i = (<O>(θ + π/2 e_i) - <O>(θ - π/2 e_i)) / 2.
+        All 2P shifted bindings are submitted to the backend in a single job.
+
+        Args:
+            param_values (list): Current parameter values (length P).
+            backend: Backend to run on. Defaults to choose_backend(ibm_priority=False).
+            observable (Callable): Maps a counts dict to an expectation value.
+                                   Defaults to parity_expectation (<Z⊗...⊗Z>).
+            shots (int): Shots per shifted binding.
+
+        Returns:
+            np.ndarray: Gradient vector of length P.
+        """
+        param_values = np.asarray(param_values, dtype=float)
+        if len(param_values) != len(self.params):
+            raise ValueError("Parameter list length must equal number of circuit parameters.")
+        observable = observable or parity_expectation
+        template = self.compile(backend)
+
+        num_params = len(self.params)
+        shifts = (np.pi / 2) * np.eye(num_params)
+        bindings = np.vstack([param_values + shifts, param_values - shifts])
+        counts = template.run(bindings, shots=shots)
+        values = np.array([observable(c) for c in counts])
+        return (values[:num_params] - values[num_params:]) / 2
+
+    def _metric_circuits(self, param_values) -> list:
+        """
+        One circuit per rotation layer: the bound circuit up to that layer, followed by
+        the basis change that maps the layer's generator (X, Y or Z) onto Z.
+        """
+        bound = self.bind_parameters(param_values)
+        circuits = []
+        for start in self.layer_starts:
+            qc = bound.copy_empty_like()
+            for instr in bound.data[:start]:
+                qc.append(instr)
+            if self.rotation_gate == 'RY':
+                qc.sdg(range(self.num_qubits))
+                qc.h(range(self.num_qubits))
+            elif self.rotation_gate == 'RX':
+                qc.h(range(self.num_qubits))
+            circuits.append(qc)
+        return circuits
+
+    def _metric_block(self, probabilities: dict) -> np.ndarray:
+        # generators are P_i / 2, so g_ij = (<P_i P_j> - <P_i><P_j>) / 4 with P_i -> Z_i after the basis change
+        keys = list(probabilities)
+        weights = np.array([probabilities[k] for k in keys], dtype=float)
+        weights /= weights.sum()
+        bits = np.array([[int(b) for b in k.replace(' ', '')[::-1]] for k in keys])
+        z = 1 - 2 * bits
+        mean = weights @ z
+        second = (z * weights[:, None]).T @ z
+        return (second - np.outer(mean, mean)) / 4
+
+    def metric_tensor(self, param_values, backend=None, shots: Optional[int] = None) -> np.ndarray:
+        """
+        Block-diagonal Fubini–Study metric tensor.
+
+        Parameters of one rotation layer act on different qubits, so their block is the
+        covariance matrix of the layer generators in the state prepared by all preceding
+        layers. Couplings between layers are dropped (block-diagonal approximation).
+
+        Args:
+            param_values (list): Current parameter values (length P).
+            backend: Backend used when shots is given. Defaults to choose_backend(ibm_priority=False).
+            shots (int): None computes the blocks exactly from prefix statevectors;
+                         otherwise all layer-prefix circuits are sampled in a single job.
+
+        Returns:
+            np.ndarray: (P, P) metric tensor, zero outside the per-layer blocks.
+        """
+        param_values = np.asarray(param_values, dtype=float)
+        circuits = self._metric_circuits(param_values)
+        if shots is None:
+            from qiskit.quantum_info import Statevector
+            distributions = [Statevector(qc).probabilities_dict() for qc in circuits]
+        else:
+            from quantumlib.execution.backend_manager import choose_backend, job_slot
+            if backend is None:
+                backend = choose_backend(ibm_priority=False)
+            measured = []
+            for qc in circuits:
+                qc = qc.copy()
+                qc.measure_all()
+                measured.append(qc)
+            with job_slot():
+                result = backend.run(transpile(measured, backend), shots=shots).result()
+            distributions = [result.get_counts(i) for i in range(len(measured))]
+
+        n = self.num_qubits
+        metric = np.zeros((len(self.params), len(self.params)))
+        for layer, probabilities in enumerate(distributions):
+            block = slice(layer * n, (layer + 1) * n)
+            metric[block, block] = self._metric_block(probabilities)
+        return metric
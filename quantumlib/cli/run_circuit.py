@@ -1,8 +1,8 @@
 import argparse
 import sys
 from qiskit import transpile
-from qiskit_aer import Aer
-from quantumlib.execution.backend_manager import choose_backend
+from quantumlib.execution.backend_manager import choose_backend, get_backend, job_slot
+from quantumlib.profiling import profiler, stage
 from quantumlib.circuits.grover import build_grover_circuit, phase_flip_oracle
 from quantumlib.circuits.hhl import hhl_circuit
 from quantumlib.circuits.vqc import VQC
@@ -36,49 +36,72 @@ def main():
     # Common arguments
     parser.add_argument("--backend", type=str, default="auto", help="Which backend to use (auto, aer, ibmq_xxx, etc.)")
     parser.add_argument("--shots", type=int, default=1024, help="Number of shots for the simulation")
+    parser.add_argument("--profile", action="store_true", help="Print a per-stage timing breakdown")
+    parser.add_argument("--profile_json", type=str, default=None, help="Also write the stage breakdown as JSON to this path")
 
     args = parser.parse_args()
+    if args.profile or args.profile_json:
+        profiler.enable()
 
-    # Build the circuit based on the selected algorithm
-    if args.circuit == "grover":
-        oracle = phase_flip_oracle(args.marked_state)
-        qc = build_grover_circuit(args.num_qubits, oracle, iterations=args.iterations)
-        print(f"Running Grover with num_qubits={args.num_qubits}, marked_state={args.marked_state}, iterations={args.iterations}")
-    elif args.circuit == "qaoa":
-        # Placeholder for QAOA: Using VQC as a simple substitute
-        vqc = VQC(num_qubits=args.qubits, num_layers=2, rotation_gate="Ry", entanglement_pattern="chain")
-        params = [0.1] * (args.qubits * 2)  # Dummy parameters
-        qc = vqc.bind_parameters(params)
-        qc.measure_all()
-        print(f"Running QAOA with qubits={args.qubits}, optimizer={args.optimizer}")
-    elif args.circuit == "hhl":
-        qc = hhl_circuit(args.num_qubits)
-        print(f"Running HHL with num_qubits={args.num_qubits}")
-    elif args.circuit == "vqc":
-        vqc = VQC(num_qubits=args.num_qubits, num_layers=args.num_layers, rotation_gate=args.rotation_gate,
-                  entanglement_pattern=args.entanglement_pattern)
-        params = [0.1] * (args.num_qubits * args.num_layers)  # Dummy parameters
-        qc = vqc.bind_parameters(params)
-        qc.measure_all()
-        print(f"Running VQC with num_qubits={args.num_qubits}, layers={args.num_layers}, rotation={args.rotation_gate}, entanglement={args.entanglement_pattern}")
-    else:
-        print(f"Unsupported circuit: {args.circuit}. Supported options: grover, qaoa, hhl, vqc")
-        sys.exit(1)
-
-    # Decide on a backend
+    # Decide on a backend (pooled instances with thread options sized for the circuit width)
+    width = getattr(args, "num_qubits", None) or getattr(args, "qubits", None)
     if args.backend == "auto":
-        backend = choose_backend(ibm_priority=False)
+        backend = choose_backend(ibm_priority=False, num_qubits=width)
     elif args.backend.startswith("ibmq"):
-        backend = Aer.get_backend("aer_simulator")  # Placeholder; update with IBMQ if available
+        backend = get_backend("aer_simulator", num_qubits=width)  # Placeholder; update with IBMQ if available
     else:
-        backend = Aer.get_backend("aer_simulator")
+        backend = get_backend("aer_simulator", num_qubits=width)
+
+    # Parametric circuits run through a transpile-once template; others are transpiled below
+    vqc = None
+    params = None
+
+    # Build the circuit based on the selected algorithm
+    with stage("build") as build:
+        if args.circuit == "grover":
+            oracle = phase_flip_oracle(args.marked_state)
+            qc = build_grover_circuit(args.num_qubits, oracle, iterations=args.iterations)
+            print(f"Running Grover with num_qubits={args.num_qubits}, marked_state={args.marked_state}, iterations={args.iterations}")
+        elif args.circuit == "qaoa":
+            # Placeholder for QAOA: Using VQC as a simple substitute
+            vqc = VQC(num_qubits=args.qubits, num_layers=2, rotation_gate="Ry", entanglement_pattern="chain")
+            params = [0.1] * (args.qubits * 2)  # Dummy parameters
+            qc = vqc.circuit
+            print(f"Running QAOA with qubits={args.qubits}, optimizer={args.optimizer}")
+        elif args.circuit == "hhl":
+            qc = hhl_circuit(args.num_qubits)
+            print(f"Running HHL with num_qubits={args.num_qubits}")
+        elif args.circuit == "vqc":
+            vqc = VQC(num_qubits=args.num_qubits, num_layers=args.num_layers, rotation_gate=args.rotation_gate,
+                      entanglement_pattern=args.entanglement_pattern)
+            params = [0.1] * (args.num_qubits * args.num_layers)  # Dummy parameters
+            qc = vqc.circuit
+            print(f"Running VQC with num_qubits={args.num_qubits}, layers={args.num_layers}, rotation={args.rotation_gate}, entanglement={args.entanglement_pattern}")
+        else:
+            print(f"Unsupported circuit: {args.circuit}. Supported options: grover, qaoa, hhl, vqc")
+            sys.exit(1)
+        if profiler.enabled:
+            build.add(num_qubits=qc.num_qubits, size=qc.size())
 
     # Run the circuit
-    qc_t = transpile(qc, backend=backend)
-    job = backend.run(qc_t, shots=args.shots)
-    result = job.result()
-    counts = result.get_counts()
+    if vqc is not None:
+        counts = vqc.compile(backend).run(params, shots=args.shots)[0]
+    else:
+        with stage("transpile") as tr:
+            qc_t = transpile(qc, backend=backend)
+            if profiler.enabled:
+                tr.add(size=qc_t.size(), depth=qc_t.depth())
+        with stage("run", shots=args.shots, circuits=1), job_slot():
+            job = backend.run(qc_t, shots=args.shots)
+            result = job.result()
+        with stage("get_counts"):
+            counts = result.get_counts()
     print("Circuit run successful. Measured counts:", counts)
 
+    if profiler.enabled:
+        print(profiler.report())
+        if args.profile_json:
+            profiler.dump_json(args.profile_json)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
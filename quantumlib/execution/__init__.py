@@ -1,11 +1,27 @@
-from .backend_manager import get_backend_info, choose_backend
-from .error_mitigation import zero_noise_extrapolation, readout_mitigation
+from .backend_manager import (get_backend_info, choose_backend, get_backend, run_parameter_binds,
+                              set_concurrency_limits, tuned_aer_options)
+from .async_executor import AsyncExecutor
+from .compiled_template import CompiledTemplate, compile_template
+from .error_mitigation import (zero_noise_extrapolation, readout_mitigation, fold_circuit, ZNEExecutor,
+                               TensoredReadoutMitigator, ReadoutCalibrator, calibration_circuits)
 from .dynamic_selector import measure_noise_level
 
 __all__ = [
     "get_backend_info",
     "choose_backend",
+    "get_backend",
+    "set_concurrency_limits",
+    "tuned_aer_options",
+    "run_parameter_binds",
+    "AsyncExecutor",
+    "CompiledTemplate",
+    "compile_template",
     "zero_noise_extrapolation",
+    "fold_circuit",
+    "ZNEExecutor",
     "readout_mitigation",
+    "TensoredReadoutMitigator",
+    "ReadoutCalibrator",
+    "calibration_circuits",
     "measure_noise_level"
 ]
@@ -0,0 +1,145 @@
+"""
+Asyncio job execution: `await executor.submit(circuits, shots)`.
+
+Small concurrent requests with the same shot count are merged into one
+backend job, blocking backend calls run in a thread pool, and the number of
+jobs in flight is bounded. Requests support cancellation and timeouts.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from qiskit import QuantumCircuit, transpile
+from .backend_manager import choose_backend, job_slot
+
+
+class _Request:
+    __slots__ = ("circuits", "future")
+
+    def __init__(self, circuits, future):
+        self.circuits = circuits
+        self.future = future
+
+
+class AsyncExecutor:
+    """
+    Asynchronous front end to a (blocking) backend.
+
+    Requests arriving within 'batch_window' seconds of each other, with the same
+    number of shots, are merged into a single backend.run call of at most
+    'max_batch_size' circuits. At most 'max_concurrency' backend jobs run at once.
+    """
+    def __init__(self, backend=None, max_concurrency=4, batch_window=0.002, max_batch_size=256,
+                 timeout=None, optimization_level=1):
+        """
+        backend: target backend, defaults to choose_backend(ibm_priority=False)
+        max_concurrency: backend jobs allowed in flight at once
+        batch_window: seconds to wait for more requests before submitting a batch
+        max_batch_size: circuits per merged job; a full batch is submitted immediately
+        timeout: default per-request timeout in seconds (None = no timeout)
+        """
+        self.backend = backend if backend is not None else choose_backend(ibm_priority=False)
+        self.max_concurrency = max_concurrency
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.timeout = timeout
+        self.optimization_level = optimization_level
+        self.jobs_submitted = 0
+        self._jobs_lock = threading.Lock()  # _execute runs on several pool threads
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency)
+        self._semaphore = None
+        self._pending = {}
+        self._flush_handles = {}
+        self._tasks = set()
+
+    async def submit(self, circuits, shots=1024, timeout=None):
+        """
+        Run one circuit or a list of circuits.
+
+        Returns the counts dictionary (single circuit) or a list of them.
+        Raises asyncio.TimeoutError after 'timeout' seconds (default: self.timeout);
+        a timed-out or cancelled request is dropped from its batch.
+        """
+        single = isinstance(circuits, QuantumCircuit)
+        circuits = [circuits] if single else list(circuits)
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        future = loop.create_future()
+        self._enqueue(loop, shots, _Request(circuits, future))
+        timeout = self.timeout if timeout is None else timeout
+        counts = await asyncio.wait_for(future, timeout) if timeout else await future
+        return counts[0] if single else counts
+
+    def _enqueue(self, loop, shots, request):
+        pending = self._pending.setdefault(shots, [])
+        pending.append(request)
+        if sum(len(r.circuits) for r in pending) >= self.max_batch_size:
+            self._flush(shots)
+        elif shots not in self._flush_handles:
+            self._flush_handles[shots] = loop.call_later(self.batch_window, self._flush, shots)
+
+    def _flush(self, shots):
+        handle = self._flush_handles.pop(shots, None)
+        if handle is not None:
+            handle.cancel()
+        requests = [r for r in self._pending.pop(shots, []) if not r.future.done()]
+        if requests:
+            task = asyncio.ensure_future(self._run_batch(requests, shots))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, requests, shots):
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            requests = [r for r in requests if not r.future.done()]
+            if not requests:
+                return
+            merged = [qc for r in requests for qc in r.circuits]
+            handle = {}
+            cancel_when_abandoned = lambda _: self._cancel_if_abandoned(handle, requests)
+            for r in requests:
+                r.future.add_done_callback(cancel_when_abandoned)
+            try:
+                result = await loop.run_in_executor(self._pool, self._execute, merged, shots, handle)
+            except Exception as exc:
+                for r in requests:
+                    if not r.future.done():
+                        r.future.set_exception(exc)
+                return
+        start = 0
+        for r in requests:
+            stop = start + len(r.circuits)
+            if not r.future.done():
+                r.future.set_result([result.get_counts(i) for i in range(start, stop)])
+            start = stop
+
+    def _execute(self, circuits, shots, handle):
+        transpiled = transpile(circuits, self.backend, optimization_level=self.optimization_level)
+        with job_slot():
+            handle['job'] = self.backend.run(transpiled, shots=shots)
+            with self._jobs_lock:
+                self.jobs_submitted += 1
+            return handle['job'].result()
+
+    @staticmethod
+    def _cancel_if_abandoned(handle, requests):
+        job = handle.get('job')
+        if job is not None and all(r.future.cancelled() for r in requests):
+            try:
+                job.cancel()
+            except Exception:
+                pass
+
+    async def close(self):
+        """Submit anything still queued, wait for running batches and release the thread pool."""
+        for shots in list(self._pending):
+            self._flush(shots)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._pool.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
@@ -1,9 +1,22 @@
 """
 Provides utilities to detect available hardware or simulators,
-and choose a default backend.
+choose a default backend, and keep a pool of configured simulator instances.
 """
+import os
+import threading
+from contextlib import contextmanager
+import numpy as np
 import qiskit
-from qiskit_aer import Aer
+from qiskit_aer import Aer, AerSimulator
+from quantumlib.profiling import stage
+
+# Aer switches to multi-threaded statevector kernels from this width on
+STATEVECTOR_PARALLEL_THRESHOLD = 14
+
+_BACKEND_POOL = {}
+_POOL_LOCK = threading.Lock()
+_LIMITS = {'max_threads': None, 'max_concurrent_jobs': None}
+_JOB_SLOTS = None
 
 def get_backend_info(backend):
     """
@@ -17,10 +30,89 @@ def get_backend_info(backend):
         info['n_qubits'] = props.qubits
     return info
 
-def choose_backend(ibm_priority=True):
+def set_concurrency_limits(max_threads=None, max_concurrent_jobs=None):
+    """
+    Per-process concurrency limits for everything run through quantumlib.
+
+    max_threads: threads a pooled simulator may use (default os.cpu_count())
+    max_concurrent_jobs: backend jobs allowed in flight at once (default unlimited)
+
+    The backend pool and the compiled templates (which hold on to pooled
+    instances) are cleared so that new instances pick up the limits.
+    """
+    global _JOB_SLOTS
+    from .compiled_template import clear_template_cache
+    with _POOL_LOCK:
+        _LIMITS['max_threads'] = max_threads
+        _LIMITS['max_concurrent_jobs'] = max_concurrent_jobs
+        _JOB_SLOTS = threading.BoundedSemaphore(max_concurrent_jobs) if max_concurrent_jobs else None
+        _BACKEND_POOL.clear()
+        clear_template_cache()
+
+def get_concurrency_limits():
+    return dict(_LIMITS)
+
+@contextmanager
+def job_slot():
+    """Hold one of the max_concurrent_jobs slots while a backend job runs."""
+    slots = _JOB_SLOTS
+    if slots is None:
+        yield
+        return
+    with slots:
+        yield
+
+def tuned_aer_options(num_qubits=None, cpu_count=None):
+    """
+    Aer execution options sized for this host and circuit width.
+
+    Narrow circuits gain most from running experiments and shots in parallel;
+    wide circuits (>= STATEVECTOR_PARALLEL_THRESHOLD qubits) put all threads
+    into the statevector kernels instead.
+    """
+    threads = _LIMITS['max_threads'] or cpu_count or os.cpu_count() or 1
+    options = {
+        'max_parallel_threads': threads,
+        'statevector_parallel_threshold': STATEVECTOR_PARALLEL_THRESHOLD,
+    }
+    if num_qubits is not None and num_qubits >= STATEVECTOR_PARALLEL_THRESHOLD:
+        options.update(max_parallel_experiments=1, max_parallel_shots=1)
+    else:
+        options.update(max_parallel_experiments=threads, max_parallel_shots=threads)
+    return options
+
+def get_backend(name='aer_simulator', num_qubits=None, **options):
+    """
+    Return a pooled, configured simulator instance.
+
+    Instances are shared by all callers asking for the same name, width class
+    (narrow/wide) and extra options, so compiled templates keyed on them stay warm.
+
+    Args:
+        name (str): Aer backend name.
+        num_qubits (int): circuit width used to size thread options (None = narrow).
+        **options: extra backend options, applied on top of the tuned ones.
+    """
+    wide = num_qubits is not None and num_qubits >= STATEVECTOR_PARALLEL_THRESHOLD
+    key = (name, wide, tuple(sorted(options.items())))
+    with _POOL_LOCK:
+        backend = _BACKEND_POOL.get(key)
+        if backend is None:
+            backend = Aer.get_backend(name)
+            tuned = tuned_aer_options(num_qubits)
+            tuned.update(options)
+            backend.set_options(**tuned)
+            _BACKEND_POOL[key] = backend
+    return backend
+
+def clear_backend_pool():
+    with _POOL_LOCK:
+        _BACKEND_POOL.clear()
+
+def choose_backend(ibm_priority=True, num_qubits=None):
     """
     If user has IBMQ and wants hardware, pick an IBM device if available.
-    Otherwise default to Aer simulator.
+    Otherwise default to the pooled Aer simulator.
     """
     try:
         from qiskit import IBMQ
@@ -31,4 +123,28 @@ def choose_backend(ibm_priority=True):
     except:
         pass
     # fallback
-    return Aer.get_backend('aer_simulator')
+    return get_backend('aer_simulator', num_qubits=num_qubits)
+
+def run_parameter_binds(backend, circuit, parameters, values, shots=1024):
+    """
+    Run one parametric circuit for many parameter bindings as a single backend job.
+
+    Args:
+        backend: backend to run on (Aer simulators take native parameter binds).
+        circuit (QuantumCircuit): transpiled parametric circuit with measurements.
+        parameters: ordered sequence of the circuit Parameters (e.g. a ParameterVector).
+        values: 2-D array of shape (num_bindings, len(parameters)).
+    Returns:
+        list of dict: counts for each binding, in row order.
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    with stage("run", shots=shots, circuits=len(values)), job_slot():
+        if isinstance(backend, AerSimulator):
+            binds = [{p: values[:, i].tolist() for i, p in enumerate(parameters)}]
+            result = backend.run([circuit], parameter_binds=binds, shots=shots).result()
+        else:
+            # Other backends: bind locally but still submit a single job
+            bound = [circuit.assign_parameters(dict(zip(parameters, row))) for row in values]
+            result = backend.run(bound, shots=shots).result()
+    with stage("get_counts"):
+        return [result.get_counts(i) for i in range(len(values))]
@@ -0,0 +1,110 @@
+"""
+Transpile-once / bind-many templates for parametric circuits.
+
+A CompiledTemplate holds the transpiled form of a parametric circuit for one
+backend and optimization level. New parameter values are bound directly into
+the transpiled circuit, so the per-evaluation cost is bind + run instead of
+bind + transpile + run.
+"""
+from collections import OrderedDict
+import numpy as np
+from qiskit import transpile
+from quantumlib.profiling import profiler, stage
+from .backend_manager import run_parameter_binds
+
+_TEMPLATE_CACHE = OrderedDict()
+_TEMPLATE_CACHE_SIZE = 64
+
+
+def circuit_fingerprint(circuit):
+    """
+    Structural key of a circuit: gate names, (symbolic) gate parameters and wiring.
+    Two circuits with the same fingerprint transpile to the same template.
+    """
+    ops = tuple(
+        (instr.operation.name,
+         tuple(str(p) for p in instr.operation.params),
+         tuple(circuit.find_bit(q).index for q in instr.qubits),
+         tuple(circuit.find_bit(c).index for c in instr.clbits))
+        for instr in circuit.data
+    )
+    return (circuit.num_qubits, circuit.num_clbits, ops)
+
+
+class CompiledTemplate:
+    """
+    Transpiled parametric circuit bound by position.
+
+    'parameters' fixes the order in which values are bound;
+    it defaults to circuit.parameters (sorted, so ParameterVector order is kept).
+    """
+    def __init__(self, circuit, backend, optimization_level=1, parameters=None):
+        self.backend = backend
+        self.optimization_level = optimization_level
+        self.parameters = list(parameters) if parameters is not None else list(circuit.parameters)
+        with stage("transpile") as tr:
+            self.circuit = transpile(circuit, backend, optimization_level=optimization_level)
+            if profiler.enabled:
+                tr.add(size=self.circuit.size(), depth=self.circuit.depth())
+
+    @property
+    def num_parameters(self):
+        return len(self.parameters)
+
+    def _check(self, values):
+        values = np.asarray(values, dtype=float)
+        if values.shape[-1] != self.num_parameters:
+            raise ValueError(f"Expected {self.num_parameters} parameter values, got {values.shape[-1]}.")
+        return values
+
+    def bind(self, values):
+        """
+        Bind values into the transpiled circuit.
+        A 1-D array gives one circuit, a 2-D array (num_bindings, P) a list of circuits.
+        """
+        values = self._check(values)
+        if values.ndim == 1:
+            return self.circuit.assign_parameters(dict(zip(self.parameters, values)))
+        return [self.circuit.assign_parameters(dict(zip(self.parameters, row))) for row in values]
+
+    def run(self, values, shots=1024):
+        """
+        Run all bindings (1-D or 2-D array of values) as one backend job.
+        Returns a list of counts dictionaries, one per binding.
+        """
+        values = np.atleast_2d(self._check(values))
+        return run_parameter_binds(self.backend, self.circuit, self.parameters, values, shots=shots)
+
+
+def compile_template(circuit, backend, optimization_level=1, parameters=None, key=None):
+    """
+    Return the cached CompiledTemplate for (structure, backend, optimization level,
+    binding order), transpiling 'circuit' only on a cache miss.
+
+    Args:
+        circuit (QuantumCircuit): parametric circuit, including measurements if counts are wanted.
+        backend: target backend.
+        optimization_level (int): transpiler optimization level.
+        parameters: binding order, defaults to circuit.parameters.
+        key: optional hashable structure key; skips fingerprinting the circuit
+             when the caller already knows its structure (e.g. VQC settings).
+    Returns:
+        CompiledTemplate
+    """
+    structure = key if key is not None else circuit_fingerprint(circuit)
+    order = tuple(p.name for p in parameters) if parameters is not None else None
+    cache_key = (structure, getattr(backend, "name", None), id(backend), optimization_level, order)
+    template = _TEMPLATE_CACHE.get(cache_key)
+    if template is None:
+        template = CompiledTemplate(circuit, backend, optimization_level, parameters)
+        _TEMPLATE_CACHE[cache_key] = template
+        if len(_TEMPLATE_CACHE) > _TEMPLATE_CACHE_SIZE:
+            _TEMPLATE_CACHE.popitem(last=False)
+    else:
+        _TEMPLATE_CACHE.move_to_end(cache_key)
+    return template
+
+
+def clear_template_cache():
+    """Drop all cached templates (e.g. after backend calibration changes)."""
+    _TEMPLATE_CACHE.clear()
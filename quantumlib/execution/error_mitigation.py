@@ -1,25 +1,338 @@
 """
-Implements zero-noise extrapolation (ZNE) and readout mitigation placeholders.
+Implements zero-noise extrapolation (ZNE) with circuit folding, and tensored readout mitigation.
 """
+import time
+from functools import lru_cache
 import numpy as np
+from qiskit import QuantumCircuit, transpile
+from .backend_manager import job_slot
 
-def zero_noise_extrapolation(evals, scales):
+def zero_noise_extrapolation(evals, scales, method='linear', asymptote=0.0):
     """
-    e.g. do a polynomial fit over noise scales => extrapolate to scale=0
-    evals: list of measured expectation values
+    Extrapolate expectation values measured at several noise scales to scale=0.
+
+    evals: measured expectation values, shape (num_scales,) or (num_scales, num_observables)
     scales: corresponding noise scale factors
-    returns extrapoled_value
+    method: 'linear' (least-squares line), 'richardson' (polynomial through all points)
+            or 'exponential' (E(s) = asymptote + b*exp(-c*s), fitted in log space)
+    asymptote: large-noise limit used by the exponential fit
+    returns extrapolated value (scalar) or one value per observable
+    """
+    evals = np.asarray(evals, dtype=float)
+    scales = np.asarray(scales, dtype=float)
+    if method == 'linear':
+        coeffs = np.polyfit(scales, evals, 1)
+        result = coeffs[-1]
+    elif method == 'richardson':
+        # Lagrange weights of the interpolating polynomial evaluated at 0
+        weights = np.array([np.prod([s_j/(s_j - s_k) for j, s_j in enumerate(scales) if j != k])
+                            for k, s_k in enumerate(scales)])
+        result = weights @ evals
+    elif method == 'exponential':
+        shifted = evals - asymptote
+        sign = np.where(shifted.mean(axis=0) < 0, -1.0, 1.0)
+        log_vals = np.log(np.maximum(np.abs(shifted), 1e-12))
+        coeffs = np.polyfit(scales, log_vals, 1)
+        result = asymptote + sign*np.exp(coeffs[-1])
+    else:
+        raise ValueError("method must be 'linear', 'richardson' or 'exponential'")
+    return result if np.ndim(result) else float(result)
+
+def fold_circuit(circuit, scale):
+    """
+    Unitary folding U -> U (U^dag U)^k, plus folding of the last gates for fractional scales.
+
+    Args:
+        circuit (QuantumCircuit): circuit without measurements.
+        scale (float): noise scale factor >= 1 (odd integers give pure global folding).
+    Returns:
+        QuantumCircuit: folded circuit with approximately 'scale' times the gates.
+    """
+    if scale < 1:
+        raise ValueError("Noise scale factors must be >= 1.")
+    gates = [instr for instr in circuit.data if instr.operation.name != 'barrier']
+    num_global = int((scale - 1) // 2)
+    num_partial = int(round((scale - 1 - 2*num_global) / 2 * len(gates)))
+    inverse = circuit.inverse()
+    folded = circuit.copy()
+    for _ in range(num_global):
+        folded.barrier()
+        folded.compose(inverse, inplace=True)
+        folded.barrier()
+        folded.compose(circuit, inplace=True)
+    if num_partial:
+        folded.barrier()
+        for instr in reversed(gates[-num_partial:]):
+            folded.append(instr.operation.inverse(), instr.qubits, instr.clbits)
+        folded.barrier()
+        for instr in gates[-num_partial:]:
+            folded.append(instr.operation, instr.qubits, instr.clbits)
+    return folded
+
+def _split_final_measurements(circuit):
+    """Split a transpiled circuit into its unitary body and its terminal measurements."""
+    body = circuit.copy_empty_like()
+    measurements = []
+    for instr in circuit.data:
+        if instr.operation.name == 'measure':
+            measurements.append(instr)
+        elif measurements and instr.operation.name != 'barrier':
+            raise ValueError("ZNE requires all measurements at the end of the circuit.")
+        else:
+            body.append(instr.operation, instr.qubits, instr.clbits)
+    return body, measurements
+
+def _z_signs(keys, observables):
+    """(num_keys, num_observables) matrix of Z-string eigenvalues for each bitstring."""
+    signs = np.ones((len(keys), len(observables)))
+    for col, label in enumerate(observables):
+        mask = sum(1 << q for q, p in enumerate(reversed(label)) if p.upper() == 'Z')
+        if set(label.upper()) - {'Z', 'I'}:
+            raise ValueError(f"Observable {label} must be a string of 'Z' and 'I'.")
+        parity = np.array([bin(k & mask).count('1') % 2 for k in keys])
+        signs[:, col] = 1 - 2*parity
+    return signs
+
+class ZNEExecutor:
+    """
+    End-to-end zero-noise extrapolation.
+
+    The base circuit is transpiled once, folded after transpilation at every
+    noise scale, and all scaled variants are submitted as one backend job.
+    Extrapolation is vectorized over any number of diagonal (Z/I) observables.
+    """
+    def __init__(self, backend=None, scales=(1, 3, 5), method='richardson', shots=8192,
+                 optimization_level=1):
+        """
+        backend: target backend, defaults to choose_backend(ibm_priority=False)
+        scales: noise scale factors
+        method: 'linear', 'richardson' or 'exponential' (see zero_noise_extrapolation)
+        """
+        from .backend_manager import choose_backend
+        self.backend = backend if backend is not None else choose_backend(ibm_priority=False)
+        self.scales = tuple(scales)
+        self.method = method
+        self.shots = shots
+        self.optimization_level = optimization_level
+
+    def scaled_circuits(self, circuit):
+        """Transpile once, then fold the transpiled body at every scale."""
+        circuit = circuit.copy()
+        if not any(instr.operation.name == 'measure' for instr in circuit.data):
+            circuit.measure_all()
+        base = transpile(circuit, self.backend, optimization_level=self.optimization_level)
+        body, measurements = _split_final_measurements(base)
+        scaled = []
+        for scale in self.scales:
+            folded = fold_circuit(body, scale)
+            for instr in measurements:
+                folded.append(instr.operation, instr.qubits, instr.clbits)
+            scaled.append(folded)
+        from qiskit_aer import AerSimulator
+        if not isinstance(self.backend, AerSimulator):
+            # inverse gates (e.g. sxdg) may fall outside the basis; translate without optimizing away folds
+            scaled = transpile(scaled, self.backend, optimization_level=0)
+        return scaled
+
+    def expectation_values(self, circuit, observables):
+        """
+        Raw expectation values, shape (num_scales, num_observables).
+        observables: Z/I label strings in Qiskit order (rightmost character = qubit 0).
+        """
+        scaled = self.scaled_circuits(circuit)
+        with job_slot():
+            result = self.backend.run(scaled, shots=self.shots).result()
+        counts_list = [result.get_counts(i) for i in range(len(self.scales))]
+        keys = sorted({k.replace(' ', '') for counts in counts_list for k in counts})
+        index = {k: i for i, k in enumerate(keys)}
+        probs = np.zeros((len(self.scales), len(keys)))
+        for row, counts in enumerate(counts_list):
+            for k, v in counts.items():
+                probs[row, index[k.replace(' ', '')]] += v
+        probs /= probs.sum(axis=1, keepdims=True)
+        return probs @ _z_signs([int(k, 2) for k in keys], observables)
+
+    def run(self, circuit, observables):
+        """Zero-noise estimates of the observables, one value per observable."""
+        evals = self.expectation_values(circuit, observables)
+        return np.atleast_1d(zero_noise_extrapolation(evals, self.scales, method=self.method))
+
+def _default_groups(num_qubits):
+    return tuple((q,) for q in range(num_qubits))
+
+class TensoredReadoutMitigator:
     """
-    # naive linear fit
-    coeffs = np.polyfit(scales, evals, 1)
-    return np.polyval(coeffs, 0.0)
+    Readout mitigation with one calibration matrix per qubit (or per qubit group).
+
+    The full 2^n inverse is never formed: it is the Kronecker product of the
+    group inverses, and it is only evaluated between observed bitstrings.
+    Bitstrings follow Qiskit's convention (qubit 0 is the rightmost bit).
+    """
+    def __init__(self, assignment_matrices, qubit_groups=None, inverse=False):
+        """
+        assignment_matrices: one matrix per group, A[measured, prepared] = P(measured | prepared),
+                             of size 2^k x 2^k for a group of k qubits
+        qubit_groups: list of qubit index lists, default one group per qubit
+        inverse: True if the matrices given are already inverted
+        """
+        matrices = [np.asarray(A, dtype=float) for A in assignment_matrices]
+        if qubit_groups is None:
+            qubit_groups = _default_groups(len(matrices))
+        self.qubit_groups = tuple(tuple(g) for g in qubit_groups)
+        if len(self.qubit_groups) != len(matrices):
+            raise ValueError("Need one calibration matrix per qubit group.")
+        for g, A in zip(self.qubit_groups, matrices):
+            if A.shape != (2**len(g), 2**len(g)):
+                raise ValueError(f"Matrix for group {g} must be {2**len(g)}x{2**len(g)}.")
+        self.num_qubits = sum(len(g) for g in self.qubit_groups)
+        self.inverses = matrices if inverse else [np.linalg.inv(A) for A in matrices]
+        self.created = time.time()
+
+    @classmethod
+    def from_calibration_counts(cls, cal_counts, num_qubits, qubit_groups=None):
+        """Build the mitigator from the counts of calibration_circuits(num_qubits, qubit_groups)."""
+        groups = tuple(tuple(g) for g in qubit_groups) if qubit_groups else _default_groups(num_qubits)
+        matrices = [np.zeros((2**len(g), 2**len(g))) for g in groups]
+        for label, counts in enumerate(cal_counts):
+            keys, values = _counts_arrays(counts)
+            for A, g in zip(matrices, groups):
+                prepared = label % 2**len(g)
+                np.add.at(A[:, prepared], _group_index(keys, g), values)
+        matrices = [A / A.sum(axis=0, keepdims=True) for A in matrices]
+        return cls(matrices, groups)
+
+    def is_stale(self, max_age):
+        """True if the calibration is older than max_age seconds."""
+        return time.time() - self.created > max_age
+
+    def apply(self, counts, clip=True):
+        """Mitigate one counts dictionary (see apply_batch)."""
+        return self.apply_batch([counts], clip=clip)[0]
+
+    def apply_batch(self, counts_list, clip=True, chunk_size=2048):
+        """
+        Mitigate many counts dictionaries at once.
+
+        The inverse is applied on the union of the observed bitstrings, with all
+        distributions processed together as the columns of one matrix.
+        Rows of the inverse are generated chunk-wise so memory stays bounded.
+
+        Args:
+            counts_list: list of counts dictionaries, each with at least one shot
+            clip: clip negative quasi-probabilities and renormalize
+            chunk_size: rows of the restricted inverse built at a time
+        Returns:
+            list of dict: mitigated counts (floats, same totals as the input)
+        """
+        keys = sorted({k.replace(' ', '') for counts in counts_list for k in counts})
+        index = {k: i for i, k in enumerate(keys)}
+        observed = np.array([int(k, 2) for k in keys], dtype=np.int64)
+        probs = np.zeros((len(keys), len(counts_list)))
+        shots = np.zeros(len(counts_list))
+        for col, counts in enumerate(counts_list):
+            for k, v in counts.items():
+                probs[index[k.replace(' ', '')], col] += v
+            shots[col] = probs[:, col].sum()
+            if shots[col] <= 0:
+                raise ValueError(f"Counts dictionary {col} has no shots to mitigate.")
+        probs /= shots
+
+        group_idx = [_group_index(observed, g) for g in self.qubit_groups]
+        mitigated = np.empty_like(probs)
+        for start in range(0, len(keys), chunk_size):
+            rows = slice(start, start + chunk_size)
+            W = np.ones((len(observed[rows]), len(observed)))
+            for inv, idx in zip(self.inverses, group_idx):
+                W *= inv[idx[rows, None], idx[None, :]]
+            mitigated[rows] = W @ probs
+
+        if clip:
+            mitigated = np.clip(mitigated, 0.0, None)
+            mitigated /= np.maximum(mitigated.sum(axis=0, keepdims=True), 1e-300)
+        mitigated *= shots
+        return [{k: mitigated[i, col] for i, k in enumerate(keys) if mitigated[i, col] != 0}
+                for col in range(len(counts_list))]
+
+def _counts_arrays(counts):
+    keys = np.array([int(k.replace(' ', ''), 2) for k in counts], dtype=np.int64)
+    return keys, np.array(list(counts.values()), dtype=float)
+
+def _group_index(keys, group):
+    """Index of each bitstring (given as integers) within a qubit group's 2^k space."""
+    idx = np.zeros_like(keys)
+    for t, q in enumerate(group):
+        idx |= ((keys >> q) & 1) << t
+    return idx
+
+@lru_cache(maxsize=32)
+def _calibration_circuits(num_qubits, qubit_groups):
+    width = max(len(g) for g in qubit_groups)
+    circuits = []
+    for label in range(2**width):
+        qc = QuantumCircuit(num_qubits, num_qubits, name=f"cal_{label}")
+        for g in qubit_groups:
+            prepared = label % 2**len(g)
+            for t, q in enumerate(g):
+                if (prepared >> t) & 1:
+                    qc.x(q)
+        qc.measure(range(num_qubits), range(num_qubits))
+        circuits.append(qc)
+    return tuple(circuits)
+
+def calibration_circuits(num_qubits, qubit_groups=None):
+    """
+    Calibration circuits for a tensored readout model (cached per layout).
+
+    All groups are calibrated in parallel, so only 2^(largest group size)
+    circuits are needed: 2 circuits for per-qubit calibration.
+    Circuit 'label' prepares label mod 2^k on every group of k qubits.
+    """
+    groups = tuple(tuple(g) for g in qubit_groups) if qubit_groups else _default_groups(num_qubits)
+    return list(_calibration_circuits(num_qubits, groups))
+
+class ReadoutCalibrator:
+    """
+    Runs the calibration circuits as one batched job and reuses the resulting
+    mitigator until it is older than max_age seconds.
+    """
+    def __init__(self, backend, num_qubits, qubit_groups=None, shots=8192, max_age=3600.0):
+        self.backend = backend
+        self.num_qubits = num_qubits
+        self.qubit_groups = qubit_groups
+        self.shots = shots
+        self.max_age = max_age
+        self._mitigator = None
+        self._transpiled = None
+
+    def mitigator(self, force=False):
+        """Return the current mitigator, recalibrating if it is missing or stale."""
+        if force or self._mitigator is None or self._mitigator.is_stale(self.max_age):
+            if self._transpiled is None:
+                self._transpiled = transpile(calibration_circuits(self.num_qubits, self.qubit_groups),
+                                             self.backend, optimization_level=0)
+            with job_slot():
+                result = self.backend.run(self._transpiled, shots=self.shots).result()
+            cal_counts = [result.get_counts(i) for i in range(len(self._transpiled))]
+            self._mitigator = TensoredReadoutMitigator.from_calibration_counts(
+                cal_counts, self.num_qubits, self.qubit_groups)
+        return self._mitigator
 
 def readout_mitigation(counts, mit_matrix):
     """
-    Apply a simple matrix-based readout error correction to the counts distribution.
-    'mit_matrix' is the inverse of calibration matrix. 
-    We'll do a placeholder approach for 2 qubits, for demonstration.
+    Apply readout error correction to one counts dictionary or a list of them.
+
+    'mit_matrix' can be a TensoredReadoutMitigator, a list of per-qubit 2x2
+    inverse calibration matrices, or a dense 2^n x 2^n inverse calibration matrix.
+    Only observed bitstrings are touched, so the cost follows the number of
+    distinct outcomes rather than 2^n.
     """
-    # placeholder logic
-    # real code: vectorize counts, multiply by inverse calibration matrix, clamp
-    return counts
+    if isinstance(mit_matrix, TensoredReadoutMitigator):
+        mitigator = mit_matrix
+    elif isinstance(mit_matrix, np.ndarray) and mit_matrix.ndim == 2:
+        num_qubits = int(np.log2(mit_matrix.shape[0]))
+        mitigator = TensoredReadoutMitigator([mit_matrix], [tuple(range(num_qubits))], inverse=True)
+    else:
+        mitigator = TensoredReadoutMitigator(mit_matrix, inverse=True)
+    if isinstance(counts, dict):
+        return mitigator.apply(counts)
+    return mitigator.apply_batch(counts)
@@ -0,0 +1,6 @@
+"""
+ml package - quantum machine learning tools built on the feature maps
+"""
+from .kernel import QuantumKernel
+
+__all__ = ["QuantumKernel"]
@@ -0,0 +1,133 @@
+"""
+Quantum kernel (Gram matrix) engine: K[i, j] = |<phi(x_i)|phi(x_j)>|^2.
+
+Statevector mode simulates one state per sample and forms the kernel with
+blocked matrix products, computing only the upper triangle of symmetric
+kernels. Shot mode runs compute-uncompute overlap circuits for i < j only.
+"""
+import hashlib
+from collections import OrderedDict
+import numpy as np
+from qiskit.circuit import ParameterVector
+from qiskit.quantum_info import Statevector
+
+
+class QuantumKernel:
+    """
+    Kernel engine for a feature map exposing construct_circuit/construct_batch
+    (ZZFeatureMap, SimpleAngleMap).
+    """
+    def __init__(self, feature_map, block_size=1024, backend=None, shots=1024,
+                 chunk_size=1024, cache_size=4):
+        """
+        feature_map: feature map instance
+        block_size: rows/columns per Gram block
+        backend: None for exact statevector mode, or a sampling backend for shot mode
+        shots: shots per overlap circuit (shot mode)
+        chunk_size: samples (or overlap circuits) per batch
+        cache_size: number of datasets whose statevectors are kept in memory
+        """
+        self.feature_map = feature_map
+        self.block_size = block_size
+        self.backend = backend
+        self.shots = shots
+        self.chunk_size = chunk_size
+        self.cache_size = cache_size
+        self._state_cache = OrderedDict()
+
+    def statevectors(self, X):
+        """
+        Encoded statevectors for the rows of X, shape (num_samples, 2**num_qubits).
+        Results are cached per dataset, so train and test kernels reuse them.
+        """
+        X = np.ascontiguousarray(X, dtype=float)
+        key = (X.shape, hashlib.sha1(X.tobytes()).hexdigest())
+        states = self._state_cache.get(key)
+        if states is not None:
+            self._state_cache.move_to_end(key)
+            return states
+        if hasattr(self.feature_map, 'amplitudes'):
+            states = self.feature_map.amplitudes(X).astype(complex)
+        else:
+            states = np.empty((len(X), 2**self.feature_map.num_qubits), dtype=complex)
+            row = 0
+            for circuits in self.feature_map.construct_batch(X, chunk_size=self.chunk_size):
+                for qc in circuits:
+                    states[row] = Statevector(qc).data
+                    row += 1
+        self._state_cache[key] = states
+        if len(self._state_cache) > self.cache_size:
+            self._state_cache.popitem(last=False)
+        return states
+
+    def evaluate(self, X, Y=None, out=None):
+        """
+        Kernel matrix between the rows of X and Y (Y=None gives the symmetric Gram matrix of X).
+
+        Args:
+            X: 2-D array (num_x, num_qubits)
+            Y: optional 2-D array (num_y, num_qubits)
+            out: None (in-memory array), a .npy path (memory-mapped output)
+                 or a preallocated float array of shape (num_x, num_y)
+        Returns:
+            np.ndarray or np.memmap of shape (num_x, num_y)
+        """
+        X = np.asarray(X, dtype=float)
+        symmetric = Y is None
+        Y = X if symmetric else np.asarray(Y, dtype=float)
+        K = self._allocate(out, (len(X), len(Y)))
+        if self.backend is None:
+            self._statevector_kernel(X, Y, K, symmetric)
+        else:
+            self._shot_kernel(X, Y, K, symmetric)
+        if isinstance(K, np.memmap):
+            K.flush()
+        return K
+
+    def _allocate(self, out, shape):
+        if out is None:
+            return np.empty(shape)
+        if isinstance(out, str):
+            return np.lib.format.open_memmap(out, mode='w+', dtype=float, shape=shape)
+        if out.shape != shape:
+            raise ValueError(f"out has shape {out.shape}, expected {shape}.")
+        return out
+
+    def _statevector_kernel(self, X, Y, K, symmetric):
+        SX = self.statevectors(X)
+        SY = SX if symmetric else self.statevectors(Y)
+        b = self.block_size
+        for i0 in range(0, len(SX), b):
+            for j0 in range(i0 if symmetric else 0, len(SY), b):
+                block = np.abs(SX[i0:i0 + b] @ SY[j0:j0 + b].conj().T)**2
+                K[i0:i0 + b, j0:j0 + b] = block
+                if symmetric and j0 != i0:
+                    K[j0:j0 + b, i0:i0 + b] = block.T
+
+    def _overlap_template(self):
+        from quantumlib.execution.compiled_template import compile_template
+        template = self.feature_map.parametric_circuit()
+        other = ParameterVector('y', self.feature_map.num_qubits)
+        overlap = template.compose(
+            template.assign_parameters(dict(zip(self.feature_map.features, other))).inverse())
+        overlap.measure_all()
+        return compile_template(overlap, self.backend,
+                                parameters=list(self.feature_map.features) + list(other))
+
+    def _shot_kernel(self, X, Y, K, symmetric):
+        template = self._overlap_template()
+        zero = '0'*self.feature_map.num_qubits
+        if symmetric:
+            # diagonal is exactly 1 and K is symmetric: only i < j needs a circuit
+            np.fill_diagonal(K, 1.0)
+            rows, cols = np.triu_indices(len(X), k=1)
+        else:
+            rows, cols = (idx.ravel() for idx in np.indices((len(X), len(Y))))
+        for start in range(0, len(rows), self.chunk_size):
+            r = rows[start:start + self.chunk_size]
+            c = cols[start:start + self.chunk_size]
+            counts = template.run(np.hstack([X[r], Y[c]]), shots=self.shots)
+            values = np.array([cts.get(zero, 0)/self.shots for cts in counts])
+            K[r, c] = values
+            if symmetric:
+                K[c, r] = values
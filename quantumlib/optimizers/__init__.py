@@ -1,13 +1,23 @@
 from .optimizer_base import OptimizerBase
+from .gradients import GradientEngine, evaluate_batch, vectorized
+from .cache import EvaluationCache, stochastic
 from .classical_opt import AdamOptimizer, RMSPropOptimizer
 from .quantum_native_opt import SPSAOptimizer, QNGOptimizer
 from .hybrid_optimizer import HybridOptimizer
+from .multistart import multistart, initial_points
 
 __all__ = [
     "OptimizerBase",
+    "GradientEngine",
+    "evaluate_batch",
+    "vectorized",
+    "EvaluationCache",
+    "stochastic",
     "AdamOptimizer",
     "RMSPropOptimizer",
     "SPSAOptimizer",
     "QNGOptimizer",
     "HybridOptimizer",
+    "multistart",
+    "initial_points",
 ]
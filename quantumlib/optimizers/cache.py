@@ -0,0 +1,114 @@
+"""
+Memoizing cost-function evaluation.
+
+Parameter vectors are quantized to a grid of spacing 'resolution' and used as
+LRU cache keys, so points that an optimizer revisits (or that appear twice in
+one batch) are evaluated once. Costs estimated from shots are random; mark
+them with @stochastic so repeated points are re-sampled instead of cached.
+"""
+from collections import OrderedDict
+import numpy as np
+from .gradients import evaluate_batch
+
+
+def stochastic(cost_fn):
+    """Mark 'cost_fn' as stochastic (e.g. shot-based): optimizers will not cache its values."""
+    cost_fn.stochastic = True
+    return cost_fn
+
+
+def is_stochastic(cost_fn):
+    return getattr(cost_fn, "stochastic", False)
+
+
+class EvaluationCache:
+    """
+    LRU cache of cost values for one cost function.
+
+    evaluate(points) looks every row up and sends only the distinct misses
+    to the evaluator (by default evaluate_batch(cost_fn, ...)); calling the
+    cache with a single parameter vector behaves like cost_fn itself.
+    """
+    def __init__(self, cost_fn, maxsize=4096, resolution=1e-10):
+        """
+        cost_fn: cost function whose values are cached
+        maxsize: maximum number of cached points
+        resolution: quantization step of the keys; keep it well below finite-difference steps
+        """
+        self.cost_fn = cost_fn
+        self.maxsize = maxsize
+        self.resolution = resolution
+        self._values = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, params):
+        """
+        Cache key of a parameter vector: the float64 bytes of params snapped to the
+        resolution grid. None for points that must not be cached (NaN, inf, or so large
+        that the grid index overflows).
+        """
+        with np.errstate(over="ignore", invalid="ignore"):
+            scaled = np.round(np.asarray(params, dtype=float)/self.resolution)
+        if not np.all(np.isfinite(scaled)):
+            return None
+        return (scaled*self.resolution + 0.0).tobytes()  # + 0.0 folds -0.0 into 0.0
+
+    def evaluate(self, points, evaluator=None):
+        """
+        Cost values for every row of 'points'.
+        evaluator(missing_points) -> values evaluates the misses (default: evaluate_batch).
+        """
+        points = np.atleast_2d(np.asarray(points, dtype=float))
+        values = np.empty(len(points))
+        keys = [self.key(p) for p in points]
+        missing = OrderedDict()
+        uncacheable = []
+        for i, key in enumerate(keys):
+            if key is None:
+                uncacheable.append(i)
+                self.misses += 1
+            elif key in self._values:
+                self._values.move_to_end(key)
+                values[i] = self._values[key]
+                self.hits += 1
+            elif key in missing:
+                missing[key].append(i)
+                self.hits += 1
+            else:
+                missing[key] = [i]
+                self.misses += 1
+        if missing or uncacheable:
+            rows = [indices[0] for indices in missing.values()] + uncacheable
+            if evaluator is None:
+                new_values = evaluate_batch(self.cost_fn, points[rows])
+            else:
+                new_values = np.asarray(evaluator(points[rows]), dtype=float).reshape(len(rows))
+            for (key, indices), value in zip(missing.items(), new_values):
+                values[indices] = value
+                self._values[key] = value
+            values[uncacheable] = new_values[len(missing):]
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+                self.evictions += 1
+        return values
+
+    def __call__(self, params):
+        return self.evaluate(np.asarray(params, dtype=float)[None])[0]
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits/total if total else 0.0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "size": len(self._values), "hit_rate": self.hit_rate}
+
+    def clear(self):
+        self._values.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._values)
@@ -0,0 +1,116 @@
+"""
+Batched gradient evaluation shared by the optimizers.
+
+All shifted parameter vectors of a gradient are collected into one 2-D batch.
+The batch is handed to a vectorized cost function when one is available,
+otherwise the individual calls are spread over a thread or process pool.
+"""
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+import numpy as np
+from quantumlib.profiling import stage
+
+
+def vectorized(batch_fn):
+    """
+    Mark 'batch_fn' as a vectorized cost function.
+
+    A vectorized cost function takes a 2-D array of shape (num_points, num_params)
+    and returns a 1-D array with one cost value per row.
+    The optimizers evaluate every point through evaluate_batch, so it can be their
+    cost_fn; code that calls cost_fn(params) on a single 1-D vector cannot use it.
+    """
+    batch_fn.vectorized = True
+    return batch_fn
+
+
+def is_vectorized(cost_fn):
+    return getattr(cost_fn, "vectorized", False)
+
+
+def evaluate_batch(cost_fn, points, executor=None):
+    """
+    Evaluate 'cost_fn' on every row of 'points'.
+
+    Args:
+        cost_fn: scalar cost function, or one marked with @vectorized.
+        points: 2-D array of shape (num_points, num_params).
+        executor: optional concurrent.futures.Executor used to spread scalar calls.
+    Returns:
+        np.ndarray: 1-D array of cost values, in row order.
+    """
+    points = np.atleast_2d(np.asarray(points, dtype=float))
+    if is_vectorized(cost_fn):
+        return np.asarray(cost_fn(points), dtype=float).reshape(len(points))
+    if executor is None or len(points) < 2:
+        return np.array([cost_fn(p) for p in points], dtype=float)
+    return np.fromiter(executor.map(cost_fn, list(points)), dtype=float, count=len(points))
+
+
+class GradientEngine:
+    """
+    Central finite-difference gradient used by Adam, RMSProp and QNG.
+
+    The 2n shifted points are evaluated as one batch instead of 2n serial calls,
+    so the wall time of a gradient follows batch throughput rather than the
+    number of parameters.
+    """
+    def __init__(self, epsilon=1e-5, executor=None, max_workers=None):
+        """
+        epsilon: central-difference step
+        executor: None (serial), 'thread', 'process', or an Executor instance.
+                  Ignored for vectorized cost functions.
+                  'process' requires a picklable cost_fn.
+        max_workers: pool size when the pool is created here
+        """
+        if executor not in (None, "thread", "process") and not isinstance(executor, Executor):
+            raise ValueError("executor must be None, 'thread', 'process' or a concurrent.futures.Executor")
+        self.epsilon = epsilon
+        self.executor = executor
+        self.max_workers = max_workers
+        self._pool = executor if isinstance(executor, Executor) else None
+        self._owns_pool = False
+
+    def _get_pool(self):
+        if self._pool is None and self.executor in ("thread", "process"):
+            pool_cls = ThreadPoolExecutor if self.executor == "thread" else ProcessPoolExecutor
+            self._pool = pool_cls(max_workers=self.max_workers)
+            self._owns_pool = True
+        return self._pool
+
+    def evaluate(self, cost_fn, points):
+        """Evaluate a batch of points with this engine's execution strategy."""
+        pool = None if is_vectorized(cost_fn) else self._get_pool()
+        with stage("cost_eval", points=len(points)):
+            return evaluate_batch(cost_fn, points, executor=pool)
+
+    def shifted_points(self, params):
+        """
+        Return the (2n, n) batch [params + eps*e_0, ..., params + eps*e_{n-1},
+        params - eps*e_0, ..., params - eps*e_{n-1}].
+        """
+        params = np.asarray(params, dtype=float)
+        shifts = self.epsilon*np.eye(len(params))
+        return np.vstack([params + shifts, params - shifts])
+
+    def combine(self, values):
+        """Turn the values of shifted_points(...) into the gradient vector."""
+        values = np.asarray(values, dtype=float)
+        n = len(values)//2
+        return (values[:n] - values[n:])/(2*self.epsilon)
+
+    def gradient(self, cost_fn, params):
+        """Central finite-difference gradient of cost_fn at params."""
+        return self.combine(self.evaluate(cost_fn, self.shifted_points(params)))
+
+    def close(self):
+        """Shut down a pool created by this engine."""
+        if self._owns_pool and self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+            self._owns_pool = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,52 +1,164 @@
 """
-HybridOptimizer: Dynamically chooses classical vs. quantum-native method 
+HybridOptimizer: Dynamically chooses classical vs. quantum-native method
 based on backend performance (execution time, noise, etc.).
 """
+import logging
 import time
 import numpy as np
 from .optimizer_base import OptimizerBase
-from .classical_opt import AdamOptimizer, RMSPropOptimizer
-from .quantum_native_opt import SPSAOptimizer, QNGOptimizer
+from .classical_opt import AdamOptimizer
+from .quantum_native_opt import SPSAOptimizer
+
+logger = logging.getLogger(__name__)
 
 class HybridOptimizer(OptimizerBase):
-    def __init__(self, maxiter=100, threshold_noise=0.01):
+    """
+    Steps a classical (finite-difference, default Adam) and a quantum-native
+    (default SPSA) optimizer, choosing per iteration with a simple cost model:
+
+    - SPSA if the backend error rate (measure_noise_level) exceeds threshold_noise,
+    - SPSA if finite differences are noise-dominated: the cost standard deviation,
+      probed every probe_every iterations, gives a per-component gradient noise of
+      std / (sqrt(2) * epsilon), compared with the RMS of the latest gradient,
+    - SPSA if the estimated classical step time (per-evaluation latency times its
+      2n + 1 evaluations) exceeds max_step_time,
+    - the classical optimizer otherwise.
+
+    Both sub-optimizers keep their state (Adam moments, SPSA gain schedule) across
+    switches. Switches are logged at INFO level on this module's logger.
+    """
+    def __init__(self, maxiter=100, threshold_noise=0.01, backend=None, classical=None, quantum=None,
+                 max_step_time=1.0, snr_threshold=3.0, noise_samples=4, probe_every=10):
         """
         maxiter: total number of iterations
         threshold_noise: if measured noise/error rate above this => use quantum optimizer (SPSA).
+        backend: backend queried with measure_noise_level once per run (optional)
+        classical, quantum: OptimizerBase subclasses implementing _ask/_tell
+                            (default Adam(lr=0.01), SPSA(c=0.1, a=0.01))
+        max_step_time: seconds a classical step may take before SPSA is preferred
+        snr_threshold: minimum gradient-to-noise ratio for finite differences
+        noise_samples: repeated evaluations of the current point per noise probe (0 disables probing)
+        probe_every: iterations between noise probes
         """
         self.maxiter = maxiter
         self.threshold_noise = threshold_noise
-    
+        self.backend = backend
+        self.classical = classical if classical is not None else AdamOptimizer(lr=0.01)
+        self.quantum = quantum if quantum is not None else SPSAOptimizer(c=0.1, a=0.01)
+        self.max_step_time = max_step_time
+        self.snr_threshold = snr_threshold
+        self.noise_samples = noise_samples
+        self.probe_every = probe_every
+        # batches handed to run()'s evaluation go through the classical optimizer's engine
+        self.gradient = getattr(self.classical, "gradient", None)
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.classical.reset()
+        self.quantum.reset()
+        self.current = None
+        self.latency = None
+        self.noise_std = None
+        self.backend_noise = None
+        self.decisions = []
+        self.evaluations = {"classical": 0, "quantum": 0, "probe": 0}
+        self.evaluations_saved = 0
+        self._active = None
+        self._probing = False
+        self._probed_iteration = None
+        self._asked_at = None
+
+    def start(self, initial_params):
+        super().start(initial_params)
+        if self.backend is not None:
+            from quantumlib.execution.dynamic_selector import measure_noise_level
+            self.backend_noise = measure_noise_level(self.backend)
+
+    def _points_per_step(self, num_params):
+        classical = 2*num_params + 1
+        quantum = 2*getattr(self.quantum, "resamplings", 1) + 1
+        return classical, quantum
+
+    def _observe_latency(self, seconds, points):
+        latency = seconds/max(points, 1)
+        self.latency = latency if self.latency is None else 0.7*self.latency + 0.3*latency
+
+    def choose(self, num_params):
+        """Return ('classical' | 'quantum', reason) from the current cost-model estimates."""
+        classical_points, quantum_points = self._points_per_step(num_params)
+        if self.backend_noise is not None and self.backend_noise > self.threshold_noise:
+            return "quantum", f"backend error rate {self.backend_noise:.3g} > {self.threshold_noise:.3g}"
+        if self.noise_std:
+            epsilon = getattr(getattr(self.classical, "gradient", None), "epsilon", 1e-5)
+            gradient_noise = self.noise_std/(np.sqrt(2)*epsilon)
+            last = getattr(self.classical, "last_gradient", None)
+            if last is None:
+                last = getattr(self.quantum, "last_gradient", None)
+            scale = np.sqrt(np.mean(last**2)) if last is not None else 0.0
+            if scale < self.snr_threshold*gradient_noise:
+                return "quantum", (f"finite differences noise-dominated (gradient rms {scale:.3g}, "
+                                   f"noise {gradient_noise:.3g})")
+        if self.latency is not None:
+            step_time = self.latency*classical_points
+            if step_time > self.max_step_time:
+                return "quantum", (f"classical step ~{step_time:.3g}s vs "
+                                   f"~{self.latency*quantum_points:.3g}s > {self.max_step_time:.3g}s budget")
+        return "classical", "cost evaluations are cheap and precise"
+
+    def _uncached_batch(self):
+        # noise probes repeat one point on purpose; once noise is seen, nothing is cached.
+        # The active sub-optimizer may also need fresh evaluations (e.g. SPSA blocking samples).
+        return (self._probing or bool(self.noise_std)
+                or (self._active is not None and self._active._uncached_batch()))
+
+    def _ask(self):
+        self._asked_at = time.perf_counter()
+        if (self.noise_samples and self.iteration % self.probe_every == 0
+                and self._probed_iteration != self.iteration):
+            self._probing = True
+            return np.tile(self.params, (self.noise_samples, 1))
+        if self._active is None:
+            method, reason = self.choose(len(self.params))
+            if method != self.current:
+                classical_points, quantum_points = self._points_per_step(len(self.params))
+                logger.info("iteration %d: using %s optimizer (%s); %d vs %d evaluations per step",
+                            self.iteration, method, reason, classical_points, quantum_points)
+                self.decisions.append({"iteration": self.iteration, "method": method, "reason": reason})
+                self.current = method
+            self._active = self.classical if method == "classical" else self.quantum
+            # both sub-optimizers keep their own state; only the position is shared
+            self._active.params = self.params
+        return self._active._ask()
+
+    def _tell(self, points, values):
+        self._observe_latency(time.perf_counter() - self._asked_at, len(points))
+        if self._probing:
+            self._probing = False
+            self._probed_iteration = self.iteration
+            self.evaluations["probe"] += len(values)
+            self.noise_std = float(np.std(values, ddof=1)) if len(values) > 1 else 0.0
+            self._track(points[0], values[0])
+            return
+
+        optimizer = self._active
+        self.evaluations[self.current] += len(values)
+        before = optimizer.iteration
+        optimizer._tell(points, values)
+        if optimizer.best_val < self.best_val:
+            self.best_val = optimizer.best_val
+            self.best_params = optimizer.best_params.copy()
+        self._last_tracked = optimizer._last_tracked
+        if optimizer.iteration > before:
+            if optimizer is self.quantum:
+                classical_points, quantum_points = self._points_per_step(len(self.params))
+                self.evaluations_saved += classical_points - quantum_points
+            self.params = optimizer.params
+            self.iteration += 1
+            self._active = None
+
     def run(self, cost_fn, initial_params):
-        # We'll maintain a current optimizer. We'll measure "noise" or "time" from cost_fn calls.
-        # For demonstration, let's say if cost_fn(...) takes too long or we detect 'noise' => switch to SPSA.
-        # If it's short => use Adam.
-        # In practice, pass a 'backend_info' or measure variance. We'll do a simple time-based check.
-        params = np.array(initial_params, dtype=float)
-        best_val = cost_fn(params)
-        best_params = params.copy()
-        
-        classical_opt = AdamOptimizer(maxiter=1, lr=0.01)  # run 1 iteration at a time
-        quantum_opt = SPSAOptimizer(maxiter=1, c=0.1, a=0.01)
-        
-        current_opt = classical_opt  # start with classical
-        for i in range(self.maxiter):
-            start = time.time()
-            # run 1 step of current optimizer
-            local_best, local_val = current_opt.run(cost_fn, params)
-            end = time.time()
-            step_time = end - start
-            
-            # update
-            params = local_best
-            if local_val < best_val:
-                best_val = local_val
-                best_params = params.copy()
-            
-            # measure step_time as a proxy for 'backend performance'
-            if step_time > 1.0:
-                # if it's too big, switch to quantum approach
-                current_opt = quantum_opt
-            else:
-                current_opt = classical_opt
+        best_params, best_val = super().run(cost_fn, initial_params)
+        logger.info("hybrid run finished: %s evaluations, %d saved by SPSA steps",
+                    self.evaluations, self.evaluations_saved)
         return best_params, best_val
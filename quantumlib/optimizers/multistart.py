@@ -0,0 +1,123 @@
+"""
+Multi-start optimization with successive halving over a process pool.
+
+Every start is an independent optimizer instance. All starts first run a short
+budget; after each rung only the best 1/eta continue, with eta times the budget,
+until the survivors reach maxiter. Optimizers keep their state between rungs
+(ask/tell state, Adam moments, SPSA gain schedule) because the instances
+themselves travel to the workers and back.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# per-worker state, set once by _init_worker
+_WORKER = {}
+
+def _make_cost(cost_fn, cost_factory, backend_options):
+    if cost_factory is None:
+        return cost_fn
+    # the backend (and the templates compiled against it) stays warm for every task of this process
+    from quantumlib.execution.backend_manager import get_backend
+    return cost_factory(get_backend(**backend_options))
+
+def _init_worker(cost_fn, cost_factory, backend_options, max_threads, max_concurrent_jobs):
+    if max_threads is not None:
+        # cap simulator threads in this worker; the parent's job limit is reapplied with a
+        # fresh semaphore, so it holds per worker, not across the pool
+        from quantumlib.execution.backend_manager import set_concurrency_limits
+        set_concurrency_limits(max_threads=max_threads, max_concurrent_jobs=max_concurrent_jobs)
+    _WORKER["cost_fn"] = _make_cost(cost_fn, cost_factory, backend_options)
+
+def _advance(optimizer, iterations, cost_fn=None):
+    optimizer.resume(cost_fn if cost_fn is not None else _WORKER["cost_fn"], iterations)
+    # the cache holds the worker's cost_fn; it is rebuilt on the next resume anyway
+    optimizer.evaluation_cache = None
+    return optimizer
+
+def _budgets(maxiter, min_iterations, eta):
+    budgets = []
+    budget = min_iterations
+    while budget < maxiter:
+        budgets.append(budget)
+        budget *= eta
+    budgets.append(maxiter)
+    return budgets
+
+def initial_points(num_starts, num_params, bounds=(-np.pi, np.pi), seed=None):
+    """Uniformly random starting points of shape (num_starts, num_params) within bounds."""
+    low, high = bounds
+    return np.random.default_rng(seed).uniform(low, high, size=(num_starts, num_params))
+
+def multistart(optimizer_factory, points, cost_fn=None, cost_factory=None, maxiter=100,
+               min_iterations=10, eta=2, max_workers=None, backend_options=None, threads_per_worker=1,
+               seed=None):
+    """
+    Run one optimizer per starting point and return the ranked results.
+
+    Args:
+        optimizer_factory: callable returning a fresh OptimizerBase (e.g. lambda: AdamOptimizer(lr=0.05)).
+                           Optimizers with an 'rng' attribute are reseeded per start from 'seed'.
+        points: (num_starts, num_params) starting points, e.g. from initial_points(...).
+        cost_fn: picklable cost function (used when cost_factory is None).
+        cost_factory: callable backend -> cost_fn, called once per worker with a pooled
+                      get_backend(**backend_options) so each worker keeps a warm backend.
+        maxiter: iterations for the starts that survive every rung.
+        min_iterations: budget of the first rung; each later rung multiplies it by eta.
+        eta: after each rung the best ceil(n / eta) starts continue.
+        max_workers: process pool size; 0 runs every start in this process
+                     (process-wide concurrency limits are left untouched).
+                     Each worker enforces the parent's max_concurrent_jobs on its own, so
+                     up to max_workers * max_concurrent_jobs jobs can be in flight.
+        backend_options: keyword arguments for get_backend in the workers.
+        threads_per_worker: simulator threads per worker (None keeps the default),
+                            so workers do not oversubscribe the cores. Ignored with max_workers=0.
+        seed: seed for the per-start optimizer generators.
+
+    Returns:
+        list of dicts sorted by value (best first), with keys
+        'start', 'initial_params', 'params', 'value', 'iterations'.
+    """
+    if (cost_fn is None) == (cost_factory is None):
+        raise ValueError("Pass exactly one of cost_fn or cost_factory.")
+    if eta < 2:
+        raise ValueError("eta must be at least 2.")
+    points = np.atleast_2d(np.asarray(points, dtype=float))
+    seeds = np.random.SeedSequence(seed).spawn(len(points))
+    optimizers = []
+    for point, start_seed in zip(points, seeds):
+        optimizer = optimizer_factory()
+        if hasattr(optimizer, "rng"):
+            optimizer.rng = np.random.default_rng(start_seed)
+        optimizer.start(point)
+        optimizers.append(optimizer)
+
+    backend_options = backend_options or {}
+    pool = local_cost = None
+    if max_workers != 0:
+        from quantumlib.execution.backend_manager import get_concurrency_limits
+        initargs = (cost_fn, cost_factory, backend_options, threads_per_worker,
+                    get_concurrency_limits()['max_concurrent_jobs'])
+        pool = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=initargs)
+    else:
+        local_cost = _make_cost(cost_fn, cost_factory, backend_options)
+    try:
+        alive = list(range(len(optimizers)))
+        for rung, budget in enumerate(_budgets(maxiter, min_iterations, eta)):
+            if rung:
+                ranked = sorted(alive, key=lambda i: optimizers[i].best_val)
+                alive = ranked[:max(1, -(-len(ranked)//eta))]
+            steps = [budget - optimizers[i].iteration for i in alive]
+            if pool is None:
+                advanced = [_advance(optimizers[i], n, local_cost) for i, n in zip(alive, steps)]
+            else:
+                advanced = list(pool.map(_advance, [optimizers[i] for i in alive], steps))
+            for i, optimizer in zip(alive, advanced):
+                optimizers[i] = optimizer
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    results = [{"start": i, "initial_params": points[i], "params": opt.best_params,
+                "value": opt.best_val, "iterations": opt.iteration}
+               for i, opt in enumerate(optimizers)]
+    return sorted(results, key=lambda r: r["value"])
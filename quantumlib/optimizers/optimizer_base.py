@@ -1,12 +1,147 @@
+import numpy as np
+from .gradients import evaluate_batch
+from .cache import EvaluationCache, is_stochastic
+
 class OptimizerBase:
     """
     Base class for an optimizer that can optimize a cost function
-    with a certain parameter vector. 
-    Each child must implement 'step' or 'run'.
+    with a certain parameter vector.
+    Each child must implement '_ask'/'_tell' or 'run'. These are subclass hooks;
+    callers drive an optimizer through start/ask/tell/resume/run only.
+
+    Ask/tell protocol: after start(initial_params), ask() returns the 2-D batch of
+    points the optimizer needs evaluated next and tell(values) feeds back one cost
+    value per row and advances the state. The caller owns evaluation, so batches of
+    several optimizers can be packed into one backend submission:
+
+        opt.start(x0)
+        while not opt.done:
+            opt.tell(evaluate(opt.ask()))
+        best_params, best_val = opt.result()
+
+    run(cost_fn, initial_params) is exactly this loop, with evaluations memoized
+    in an EvaluationCache unless cost_fn is marked @stochastic. Set 'cache' to
+    an EvaluationCache of the same cost_fn to share it across runs, or to False
+    to disable caching; the cache used by the last run is 'evaluation_cache'.
     """
+    maxiter = 100
+    cache = True
+    cache_size = 4096
+    evaluation_cache = None
+
+    def reset(self):
+        """Clear iteration state and the best point found so far."""
+        self.params = None
+        self.iteration = 0
+        self.best_params = None
+        self.best_val = np.inf
+        self._last_tracked = None
+        self._pending = None
+        self._final = False
+        self._finished = False
+
+    def start(self, initial_params):
+        """Reset the state and start a new optimization from initial_params."""
+        self.reset()
+        self.params = np.array(initial_params, dtype=float)
+
+    def _ask(self):
+        """Points for the next evaluation batch of the current iteration."""
+        raise NotImplementedError()
+
+    def _tell(self, points, values):
+        """
+        Consume the values of _ask()'s points. Increments self.iteration and
+        updates self.params once an iteration is complete.
+        """
+        raise NotImplementedError()
+
+    def ask(self):
+        """
+        Return the (num_points, num_params) batch to evaluate next.
+        Repeated calls before tell return the same batch.
+        """
+        if self.params is None:
+            raise RuntimeError("Call start(initial_params) before ask().")
+        if self._pending is None and not self.done:
+            self._final = self.iteration >= self.maxiter
+            # after the last iteration only the final point is left, unless it was already evaluated
+            self._pending = self.params[None].copy() if self._final else np.atleast_2d(self._ask())
+        return self._pending
+
+    def tell(self, values):
+        """Report the cost values (one per row) of the batch returned by ask()."""
+        points = self._pending
+        if points is None:
+            raise RuntimeError("tell() called without a pending ask().")
+        values = np.asarray(values, dtype=float).reshape(len(points))
+        self._pending = None
+        if self._final:
+            self._track(points[0], values[0])
+            self._finished = True
+        else:
+            self._tell(points, values)
+
+    @property
+    def done(self):
+        if self._finished:
+            return True
+        return (self.iteration >= self.maxiter and self._last_tracked is not None
+                and np.array_equal(self._last_tracked, self.params))
+
+    def result(self):
+        """(best_params, best_value) over all exactly evaluated points so far."""
+        return self.best_params, self.best_val
+
+    def _track(self, params, value):
+        self._last_tracked = params
+        if value < self.best_val:
+            self.best_val = value
+            self.best_params = np.array(params, dtype=float)
+
+    def _evaluate(self, cost_fn, points):
+        engine = getattr(self, "gradient", None)
+        if engine is not None:
+            return engine.evaluate(cost_fn, points)
+        return evaluate_batch(cost_fn, points)
+
+    def _uncached_batch(self):
+        """True when the pending batch must reach cost_fn even for repeated points (noise probes)."""
+        return False
+
+    def _evaluation_cache(self, cost_fn):
+        if not self.cache or is_stochastic(cost_fn):
+            return None
+        if isinstance(self.cache, EvaluationCache) and self.cache.cost_fn is cost_fn:
+            return self.cache
+        return EvaluationCache(cost_fn, maxsize=self.cache_size)
+
     def run(self, cost_fn, initial_params):
         """
-        Perform the optimization. 
+        Perform the optimization.
         returns (best_params, best_value)
         """
-        raise NotImplementedError()
+        self.evaluation_cache = None
+        self.start(initial_params)
+        return self.resume(cost_fn)
+
+    def resume(self, cost_fn, iterations=None):
+        """
+        Continue the current optimization until done and return (best_params, best_value).
+        iterations: run this many more iterations (raising maxiter), e.g. to extend
+                    a finished run in stages.
+        """
+        if iterations is not None:
+            self.maxiter = self.iteration + iterations
+            self._finished = False
+        cache = self.evaluation_cache
+        if cache is None or cache.cost_fn is not cost_fn:
+            cache = self.evaluation_cache = self._evaluation_cache(cost_fn)
+        while not self.done:
+            points = self.ask()
+            if cache is None or self._uncached_batch():
+                values = self._evaluate(cost_fn, points)
+            else:
+                values = cache.evaluate(points, lambda missing: self._evaluate(cost_fn, missing))
+            self.tell(values)
+        return self.result()
@@ -1,71 +1,206 @@
 import numpy as np
 from .optimizer_base import OptimizerBase
+from .gradients import GradientEngine
 
 class SPSAOptimizer(OptimizerBase):
-    def __init__(self, maxiter=100, c=0.1, a=0.01):
+    """
+    Simultaneous perturbation stochastic approximation.
+
+    Each iteration evaluates all +/- perturbations (and, when tracking, the current
+    point) as a single batch through a GradientEngine, so a vectorized cost function
+    or an executor-backed engine sees one call per iteration instead of three or more.
+    """
+    def __init__(self, maxiter=100, c=0.1, a=0.01, alpha=0.6, gamma=0.2, A=0.0,
+                 resamplings=1, track_every=1, blocking=False, allowed_increase=None,
+                 calibrate=False, target_magnitude=2*np.pi/10, calibration_steps=10,
+                 gradient=None, seed=None):
         """
         c => step size for parameter perturbation
         a => learning rate scale
+        alpha, gamma, A => gain schedules a_k = a/(k+A)^alpha and c_k = c/k^gamma
+        resamplings => perturbations averaged per gradient estimate
+        track_every => evaluate the current point every N iterations to track the best value
+                       (batched with that iteration's perturbations); 0 only evaluates the final point
+        blocking => reject updates that raise the cost by more than allowed_increase
+                    (costs one extra evaluation per iteration)
+        allowed_increase => blocking tolerance; None estimates 2*std of the cost at the initial point
+        calibrate => set 'a' so the first step has size target_magnitude (Spall's calibration),
+                     from calibration_steps perturbations evaluated as one batch
+        gradient => GradientEngine used to evaluate the batches (defaults to a serial engine)
+        seed => seed for the perturbation generator
         """
         self.maxiter = maxiter
         self.c = c
         self.a = a
-    
-    def run(self, cost_fn, initial_params):
-        params = np.array(initial_params, dtype=float)
-        best_val = cost_fn(params)
-        best_params = params.copy()
-        for k in range(1, self.maxiter+1):
-            ck = self.c/(k**0.2)  # typical SPSA decay
-            ak = self.a/(k**0.6) 
-            delta = np.random.choice([-1,1], size=len(params))
-            params_plus = params + ck*delta
-            params_minus = params - ck*delta
-            fplus = cost_fn(params_plus)
-            fminus = cost_fn(params_minus)
-            g = (fplus - fminus)/(2*ck*delta)
-            params = params - ak*g
-            val = cost_fn(params)
-            if val < best_val:
-                best_val = val
-                best_params = params.copy()
-        return best_params, best_val
+        self.alpha = alpha
+        self.gamma = gamma
+        self.A = A
+        self.resamplings = resamplings
+        self.track_every = track_every
+        self.blocking = blocking
+        self.allowed_increase = allowed_increase
+        self.calibrate = calibrate
+        self.target_magnitude = target_magnitude
+        self.calibration_steps = calibration_steps
+        self.gradient = gradient if gradient is not None else GradientEngine()
+        self.rng = np.random.default_rng(seed)
+        self.reset()
+
+    def _perturbations(self, num, dim):
+        return self.rng.choice([-1.0, 1.0], size=(num, dim))
+
+    def _pair_points(self, params, ck, deltas):
+        return np.vstack([params + ck*deltas, params - ck*deltas])
+
+    def _gain_from(self, pair_values):
+        n = len(pair_values)//2
+        magnitude = np.mean(np.abs(pair_values[:n] - pair_values[n:]))/(2*self.c)
+        if magnitude == 0:
+            return self.a
+        return self.target_magnitude*(1 + self.A)**self.alpha/magnitude
+
+    def calibrate_gain(self, cost_fn, params):
+        """
+        Learning-rate scale such that the first update has magnitude target_magnitude:
+        a = target_magnitude * (1 + A)^alpha / mean |f+ - f-| / (2c).
+        """
+        params = np.asarray(params, dtype=float)
+        deltas = self._perturbations(self.calibration_steps, len(params))
+        return self._gain_from(self._evaluate(cost_fn, self._pair_points(params, self.c, deltas)))
+
+    def reset(self):
+        super().reset()
+        self.k = 0
+        self.current_val = None
+        self.tolerance = None
+        self.last_gradient = None
+        self._phase = "start"
+        self._candidate = None
+        self._perturbation = None
+
+    def _num_blocking_samples(self):
+        if not self.blocking:
+            return 0
+        return 1 if self.allowed_increase is not None else 10
+
+    def _uncached_batch(self):
+        # the blocking tolerance comes from the spread of repeated evaluations
+        return self._phase == "start" and self.blocking
+
+    def _ask(self):
+        params = self.params
+        if self._phase == "start":
+            # calibration pairs and the blocking reference samples share one batch
+            points = [np.tile(params, (self._num_blocking_samples(), 1))]
+            if self.calibrate:
+                deltas = self._perturbations(self.calibration_steps, len(params))
+                points.append(self._pair_points(params, self.c, deltas))
+            points = np.vstack(points)
+            if len(points):
+                return points
+            self._phase = "pairs"
+        if self._phase == "pairs":
+            k = self.k + 1
+            ck = self.c/(k**self.gamma)  # typical SPSA decay
+            deltas = self._perturbations(self.resamplings, len(params))
+            track = not self.blocking and self.track_every and (k - 1) % self.track_every == 0
+            self._perturbation = (ck, deltas, bool(track))
+            pairs = self._pair_points(params, ck, deltas)
+            return np.vstack([params[None], pairs]) if track else pairs
+        return self._candidate[None]
+
+    def _tell(self, points, values):
+        if self._phase == "start":
+            num_samples = self._num_blocking_samples()
+            if self.calibrate:
+                self.a = self._gain_from(values[num_samples:])
+            if self.blocking:
+                samples = values[:num_samples]
+                self.current_val = samples[0]
+                self._track(self.params, samples[0])
+                self.tolerance = self.allowed_increase if self.allowed_increase is not None else 2*np.std(samples)
+            self._phase = "pairs"
+        elif self._phase == "pairs":
+            ck, deltas, track = self._perturbation
+            if track:
+                self._track(points[0], values[0])
+                values = values[1:]
+            self.k += 1
+            ak = self.a/((self.k + self.A)**self.alpha)
+            n = len(deltas)
+            # 1/delta == delta for +/-1 perturbations
+            g = self.last_gradient = np.mean((values[:n] - values[n:])[:, None]*deltas, axis=0)/(2*ck)
+            candidate = self.params - ak*g
+            if self.blocking:
+                self._candidate = candidate
+                self._phase = "block"
+            else:
+                self.params = candidate
+                self.iteration += 1
+        else:
+            # blocking: reject updates that raise the cost by more than the tolerance
+            val = values[0]
+            if val <= self.current_val + self.tolerance:
+                self.current_val = val
+                self._track(self._candidate, val)
+                self.params = self._candidate
+            self._phase = "pairs"
+            self.iteration += 1
 
 class QNGOptimizer(OptimizerBase):
     """
-    Approx Quantum Natural Gradient using partial metric evaluation or a derivative-based approach.
-    Placeholder: real QNG would measure the Fubini-Study metric.
+    Quantum natural gradient: params <- params - lr * (F + reg*I)^-1 grad.
+
+    F is the Fubini–Study metric supplied by 'metric' (e.g. VQC.metric_tensor's
+    block-diagonal approximation). It is recomputed only every metric_refresh
+    iterations; in between the cached regularized inverse is reused. The metric
+    is evaluated inside tell(), outside the ask/tell cost batches.
     """
-    def __init__(self, maxiter=50):
+    def __init__(self, maxiter=50, lr=0.05, metric=None, metric_refresh=1, regularization=1e-3,
+                 gradient=None):
+        """
+        lr: step size
+        metric: object with metric_tensor(params) (e.g. a VQC), a callable params -> (P, P) matrix,
+                or None for the identity metric (plain gradient descent)
+        metric_refresh: iterations between metric evaluations
+        regularization: added to the metric diagonal before inverting
+        gradient: GradientEngine used for the finite-difference gradient
+        """
         self.maxiter = maxiter
-    
-    def run(self, cost_fn, initial_params):
-        params = np.array(initial_params, dtype=float)
-        # For demonstration, let's do a naive approach: measure an approximate metric = identity
-        # Then standard gradient descent. Real QNG would require extra circuit evaluations.
-        best_val = cost_fn(params)
-        best_params = params.copy()
-        for i in range(self.maxiter):
-            grad = self._finite_diff_gradient(cost_fn, params)
-            # QNG step: (F^-1) * grad -> if F = I, it's just grad
-            step = grad
-            # scale step by some factor
-            alpha = 0.05
-            params = params - alpha*step
-            val = cost_fn(params)
-            if val < best_val:
-                best_val = val
-                best_params = params.copy()
-        return best_params, best_val
-    
-    def _finite_diff_gradient(self, cost_fn, params, epsilon=1e-5):
-        grad = np.zeros_like(params)
-        for i in range(len(params)):
-            orig = params[i]
-            params[i] = orig + epsilon
-            fplus = cost_fn(params)
-            params[i] = orig - epsilon
-            fminus = cost_fn(params)
-            grad[i] = (fplus - fminus)/(2*epsilon)
-            params[i] = orig
-        return grad
+        self.lr = lr
+        self.metric = metric
+        self.metric_refresh = metric_refresh
+        self.regularization = regularization
+        self.gradient = gradient if gradient is not None else GradientEngine()
+        self.metric_evaluations = 0
+        self.reset()
+
+    def metric_tensor(self, params):
+        if self.metric is None:
+            return np.eye(len(params))
+        self.metric_evaluations += 1
+        metric_fn = getattr(self.metric, "metric_tensor", self.metric)
+        return np.asarray(metric_fn(params), dtype=float)
+
+    def inverse_metric(self, params):
+        """Regularized inverse (F + reg*I)^-1 of the metric at params."""
+        metric = self.metric_tensor(params)
+        return np.linalg.inv(metric + self.regularization*np.eye(len(params)))
+
+    def reset(self):
+        super().reset()
+        self.t = 0
+        self.inverse = None
+        self.last_gradient = None
+
+    def _ask(self):
+        return np.vstack([self.params, self.gradient.shifted_points(self.params)])
+
+    def _tell(self, points, values):
+        self._track(points[0], values[0])
+        grad = self.last_gradient = self.gradient.combine(values[1:])
+        if self.inverse is None or self.t % self.metric_refresh == 0:
+            self.inverse = self.inverse_metric(self.params)
+        self.t += 1
+        self.params = self.params - self.lr*(self.inverse @ grad)
+        self.iteration += 1
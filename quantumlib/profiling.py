@@ -0,0 +1,147 @@
+"""
+Stage timers and counters for quantumlib.
+
+    from quantumlib.profiling import profiler, stage
+    profiler.enable()
+    with stage("transpile") as s:
+        qc_t = transpile(qc, backend)
+        if profiler.enabled:
+            s.add(depth=qc_t.depth())
+    print(profiler.report())
+
+While the profiler is disabled (the default) stage() returns one shared no-op
+object, so instrumented code pays a single attribute check per stage. Counters
+that are expensive to compute should be guarded with 'if profiler.enabled:',
+since add()'s arguments are evaluated either way.
+
+Stages may be entered concurrently from several threads (e.g. a cost function
+wrapped with profiler.wrap inside a GradientEngine thread pool); updates to the
+statistics are serialized by a per-profiler lock.
+"""
+import functools
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add(self, **counters):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class StageStats:
+    """Accumulated wall time, CPU time, call count and counters of one stage."""
+    __slots__ = ("calls", "wall_s", "cpu_s", "counters")
+
+    def __init__(self):
+        self.calls = 0
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.counters = OrderedDict()
+
+    def as_dict(self):
+        return {"calls": self.calls, "wall_s": self.wall_s, "cpu_s": self.cpu_s,
+                "counters": dict(self.counters)}
+
+
+class _Stage:
+    __slots__ = ("stats", "_lock", "_wall", "_cpu")
+
+    def __init__(self, stats, lock, counters):
+        self.stats = stats
+        self._lock = lock
+        self.add(**counters)
+
+    def __enter__(self):
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        with self._lock:
+            self.stats.calls += 1
+            self.stats.wall_s += wall
+            self.stats.cpu_s += cpu
+        return False
+
+    def add(self, **counters):
+        """Add counter values (summed over calls) to this stage."""
+        with self._lock:
+            for name, value in counters.items():
+                self.stats.counters[name] = self.stats.counters.get(name, 0) + value
+
+
+class Profiler:
+    """Collects per-stage statistics while enabled."""
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.stages = OrderedDict()
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self.stages.clear()
+
+    def stage(self, name, **counters):
+        """Context manager timing one stage; the yielded object takes extra counters via add()."""
+        if not self.enabled:
+            return _NULL_STAGE
+        with self._lock:
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = StageStats()
+        return _Stage(stats, self._lock, counters)
+
+    def wrap(self, fn, name=None):
+        """Wrap a callable (e.g. an optimizer cost_fn) so each call is recorded as a stage."""
+        name = name or getattr(fn, "__name__", "call")
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with self.stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    def as_dict(self):
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in self.stages.items()}
+
+    def dump_json(self, path):
+        with open(path, "w") as fh:
+            json.dump(self.as_dict(), fh, indent=2)
+
+    def report(self):
+        """Human-readable per-stage breakdown."""
+        total = sum(s.wall_s for s in self.stages.values()) or 1.0
+        lines = [f"{'stage':<16}{'calls':>7}{'wall [s]':>11}{'cpu [s]':>10}{'share':>8}  counters"]
+        for name, s in self.stages.items():
+            counters = ", ".join(f"{k}={v}" for k, v in s.counters.items())
+            lines.append(f"{name:<16}{s.calls:>7}{s.wall_s:>11.4f}{s.cpu_s:>10.4f}"
+                         f"{100*s.wall_s/total:>7.1f}%  {counters}")
+        return "\n".join(lines)
+
+
+profiler = Profiler()
+
+
+def stage(name, **counters):
+    """Time a stage on the process-wide profiler."""
+    return profiler.stage(name, **counters)
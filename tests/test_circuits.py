@@ -8,3 +8,205 @@ def test_qft_back_and_forth():
     after_qft = state_in.evolve(qc)
     after_inv = after_qft.evolve(qc.inverse())
     assert after_inv.equiv(state_in), "QFT + inverse QFT not returning original state"
+
+def test_vqc_parameter_shift_gradient():
+    import numpy as np
+    from qiskit.quantum_info import SparsePauliOp
+    from quantumlib.circuits.vqc import VQC
+
+    vqc = VQC(num_qubits=2, num_layers=2)
+    theta = np.array([0.3, -0.7, 1.1, 0.4])
+    parity = SparsePauliOp("ZZ")
+
+    def exact(values):
+        return Statevector(vqc.bind_parameters(values)).expectation_value(parity).real
+
+    fd = np.array([(exact(theta + 1e-6*e) - exact(theta - 1e-6*e))/2e-6 for e in np.eye(4)])
+    grad = vqc.parameter_shift_gradient(theta, shots=20000)
+    assert grad.shape == (4,)
+    assert np.allclose(grad, fd, atol=0.05)
+
+def test_qaoa_parametric_mode_matches_build():
+    import numpy as np
+    from qiskit.quantum_info import Operator
+    from quantumlib.circuits import QAOAAnsatz
+
+    def problem(qc, gamma):
+        qc.rzz(gamma, 0, 1)
+        qc.rzz(gamma, 1, 2)
+
+    ansatz = QAOAAnsatz(num_qubits=3, p=2, problem_func=problem)
+    params = [0.3, 0.7, -0.2, 1.1]
+    assert Operator(ansatz.bind(params)).equiv(Operator(ansatz.build(params)))
+    assert ansatz.parametric_circuit() is ansatz.parametric_circuit()
+
+    counts = ansatz.run_batch(np.array([params, np.zeros(4)]), shots=128)
+    assert len(counts) == 2
+    assert all(sum(c.values()) == 128 for c in counts)
+
+def test_feature_map_batches():
+    import numpy as np
+    from quantumlib.circuits import SimpleAngleMap, ZZFeatureMap
+
+    X = np.random.default_rng(3).uniform(0, np.pi, size=(5, 3))
+    angle_map = SimpleAngleMap(3)
+    amps = angle_map.amplitudes(X)
+    for row, amp in zip(X, amps):
+        assert np.allclose(Statevector(angle_map.construct_circuit(row)).data, amp)
+
+    zz = ZZFeatureMap(3)
+    chunks = list(zz.construct_batch(X, chunk_size=2))
+    assert [len(c) for c in chunks] == [2, 2, 1]
+    assert Statevector(chunks[1][0]).equiv(Statevector(zz.construct_circuit(X[2])))
+    counts = [c for chunk in zz.run_batch(X, shots=32, chunk_size=4) for c in chunk]
+    assert len(counts) == 5
+
+def test_grover_analytic_matches_statevector():
+    from quantumlib.circuits.grover import (build_grover_circuit, phase_flip_oracle, optimal_iterations,
+                                            simulate_grover)
+
+    qc = build_grover_circuit(3, phase_flip_oracle('101'), iterations=2)
+    qc.remove_final_measurements()
+    p_circuit = Statevector(qc).probabilities_dict()['101']
+    analytic = simulate_grover(3, ['101'], iterations=2, shots=500, seed=1)
+    assert abs(analytic['success_probability'] - p_circuit) < 1e-9
+    assert sum(analytic['counts'].values()) == 500
+
+    big = simulate_grover(80, [12345], shots=100, seed=0)
+    assert big['iterations'] == optimal_iterations(80)
+    assert big['success_probability'] > 0.999
+
+def test_compiled_oracle_marks_exactly_the_given_states():
+    import numpy as np
+    from qiskit.quantum_info import Operator
+    from quantumlib.circuits.grover import compile_oracle
+
+    marked = ['0101', '0111', '1101', '1111', '0010']
+    oracle = compile_oracle(4, marked_states=marked)
+    expected = np.ones(16)
+    expected[[int(m, 2) for m in marked]] = -1
+    assert np.allclose(Operator(oracle).data, np.diag(expected))
+    assert compile_oracle(4, marked_states=reversed(marked)) is oracle
+    ops = oracle.count_ops()
+    # cube {qubit0=1, qubit2=1} needs a CZ, state 0010 one 3-control MCX, instead of 5 MCX
+    assert ops.get('cx', 0) == 1 and ops.get('mcx', 0) == 1
+
+    # qubit 0 set OR (qubit 1 set AND qubit 2 clear)
+    dnf = compile_oracle(3, dnf=[[1], [2, -3]])
+    cnf = compile_oracle(3, cnf=[[1, 2], [1, -3]])
+    assert Operator(dnf).equiv(Operator(cnf))
+    assert dnf.metadata['num_marked'] == 5
+
+def test_qft_matches_dft_and_fft_path():
+    import numpy as np
+    from qiskit import QuantumCircuit
+    from qiskit.quantum_info import Operator, random_statevector
+    from quantumlib.circuits.qft import qft_circuit, qft_error_bound, apply_qft
+
+    n, N = 4, 16
+    dft = np.exp(2j*np.pi*np.outer(np.arange(N), np.arange(N))/N)/np.sqrt(N)
+    assert np.allclose(Operator(qft_circuit(n)).data, dft)
+    for degree in (1, 2):
+        approx = Operator(qft_circuit(n, approximation_degree=degree)).data
+        assert np.linalg.norm(approx - dft, 2) <= qft_error_bound(n, degree) + 1e-12
+    assert qft_circuit(12, approximation_degree=8).count_ops()['cp'] < qft_circuit(12).count_ops()['cp']
+
+    psi = random_statevector(32, seed=4)
+    qc = QuantumCircuit(5)
+    qc.compose(qft_circuit(3, do_swap=False).inverse(), [0, 2, 3], inplace=True)
+    assert np.allclose(psi.evolve(qc).data, apply_qft(psi, [0, 2, 3], inverse=True, do_swap=False))
+
+def test_qpe_uses_one_controlled_power_per_ancilla():
+    import numpy as np
+    from qiskit import QuantumCircuit, transpile
+    from quantumlib.circuits.qpe import qpe_circuit
+    from quantumlib.execution.backend_manager import choose_backend
+
+    phase = 0.375  # exactly representable with 3 ancillas -> '011'
+    u = QuantumCircuit(1)
+    u.p(2*np.pi*phase, 0)
+    qc = QuantumCircuit(4, 3)
+    qc.x(3)  # eigenstate |1> of the phase gate
+    qc.compose(qpe_circuit(u, num_ancillas=3, num_target=1), inplace=True)
+    assert len(qpe_circuit(u, num_ancillas=10, num_target=1).data) == 10 + 10 + 1 + 10
+
+    backend = choose_backend(ibm_priority=False)
+    counts = backend.run(transpile(qc, backend), shots=256).result().get_counts()
+    assert counts == {'011': 256}
+
+    matrix = np.diag([1, np.exp(2j*np.pi*phase)])
+    same = qpe_circuit(matrix, num_ancillas=3, num_target=1)
+    assert same.data[3].operation is qpe_circuit(u, num_ancillas=3, num_target=1).data[3].operation
+
+def test_ising_annealing_simulator_matches_circuit():
+    import numpy as np
+    from quantumlib.circuits.quantum_annealing import annealing_circuit, AnnealingSimulator
+
+    h = [0.3, -0.5, 0.0, 0.2]
+    J = [(0, 1, 1.0), (1, 3, -0.7), (0, 2, 0.4)]
+    schedule = [(0.2, 0.5), (0.5, 0.4), (0.9, 0.3)]
+    qc = annealing_circuit(schedule, num_qubits=4, h=h, J=J)
+    assert qc.count_ops()['rzz'] == len(J)*(len(schedule) + 1)
+
+    sim = AnnealingSimulator(4, h=h, J=J)
+    assert np.allclose(sim.statevector(schedule), Statevector(qc).data)
+    states = sim.run_batch(np.array([schedule, schedule[::-1]]))
+    assert np.allclose(states[1], Statevector(annealing_circuit(schedule[::-1], 4, h, J)).data)
+    assert sim.expectation(states).shape == (2,)
+
+    chain = annealing_circuit(schedule, num_qubits=3)
+    assert chain.count_ops()['rzz'] == 2*(len(schedule) + 1)
+
+def test_qaoa_statevector_matches_circuit_and_gradient():
+    import numpy as np
+    from quantumlib.circuits import QAOAAnsatz, QAOAStatevector
+
+    h = [0.5, 0.0, -0.3]
+    J = [(0, 1, 1.0), (1, 2, -0.6), (0, 2, 0.8)]
+
+    def problem(qc, gamma):
+        for i, j, coupling in J:
+            qc.rzz(2*gamma*coupling, i, j)
+        for i, hi in enumerate(h):
+            if hi:
+                qc.rz(2*gamma*hi, i)
+
+    params = np.array([0.4, 0.3, -0.7, 1.1])
+    evaluator = QAOAStatevector.from_ising(3, h, J)
+    circuit_state = Statevector(QAOAAnsatz(3, 2, problem).build(params)).data
+    assert np.allclose(evaluator.statevector(params), circuit_state)
+
+    batch = np.array([params, params[::-1]])
+    values, grads = evaluator.value_and_gradient(batch)
+    assert np.allclose(values, evaluator.expectation(batch))
+    eps = 1e-6
+    for k in range(4):
+        shift = np.zeros(4)
+        shift[k] = eps
+        fd = (evaluator.expectation(batch + shift) - evaluator.expectation(batch - shift))/(2*eps)
+        assert np.allclose(grads[:, k], fd, atol=1e-6)
+
+def test_qaoa_landscape_sweep_resumes(tmp_path):
+    import numpy as np
+    import pytest
+    from quantumlib.circuits import QAOAStatevector, LandscapeSweep, landscape_sweep
+
+    J = [(0, 1, 1.0), (1, 2, 1.0), (0, 2, 1.0)]
+    evaluator = QAOAStatevector.from_ising(3, J=J)
+    axes = [np.linspace(0, np.pi, 7), np.linspace(0, np.pi/2, 5)]
+    path = tmp_path / "landscape.npy"
+
+    def interrupt(done, total, best):
+        if done == 2:
+            raise KeyboardInterrupt
+    sweep = LandscapeSweep(evaluator.cost, axes, path, chunk_size=8, max_workers=0, top_k=3)
+    with pytest.raises(KeyboardInterrupt):
+        sweep.run(interrupt)
+    assert sweep.done.sum() == 2 and not sweep.complete
+
+    values, best = landscape_sweep(evaluator.cost, axes, path, chunk_size=8, max_workers=2, top_k=3)
+    grid = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 2)
+    expected = evaluator.expectation(grid).reshape(7, 5)
+    assert np.allclose(values, expected)
+    assert np.isclose(best[0][0], expected.min())
+    assert np.isclose(evaluator.expectation(best[0][1]), expected.min())
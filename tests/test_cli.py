@@ -5,3 +5,15 @@ def test_cli_help():
     proc = subprocess.run(["run_circuit", "--help"], capture_output=True, text=True)
     assert proc.returncode == 0
     assert "usage" in proc.stdout.lower()
+
+def test_cli_profile_json(tmp_path):
+    import json
+    out = tmp_path / "profile.json"
+    proc = subprocess.run(["run_circuit", "--profile", "--profile_json", str(out),
+                           "grover", "--num_qubits", "2", "--marked_state", "11"],
+                          capture_output=True, text=True)
+    assert proc.returncode == 0
+    assert "transpile" in proc.stdout
+    stages = json.loads(out.read_text())
+    assert {"build", "transpile", "run", "get_counts"} <= set(stages)
+    assert stages["run"]["counters"]["shots"] == 1024
@@ -6,3 +6,172 @@ def test_measure_noise_level():
     backend = choose_backend(ibm_priority=False)
     noise = measure_noise_level(backend)
     assert noise >= 0.0, "Noise level should be non-negative"
+
+def test_compiled_template_is_cached_and_binds_batches():
+    import numpy as np
+    from quantumlib.circuits.vqc import VQC
+
+    backend = choose_backend(ibm_priority=False)
+    template = VQC(num_qubits=2, num_layers=2).compile(backend)
+    assert VQC(num_qubits=2, num_layers=2).compile(backend) is template, "same structure should reuse the template"
+
+    values = np.zeros((3, 4))
+    values[1, :2] = np.pi  # |11> before the chain CX, |01> after it
+    counts = template.run(values, shots=64)
+    assert len(counts) == 3
+    assert counts[0] == {'00': 64}
+    assert counts[1] == {'01': 64}
+
+def test_compiled_template_keeps_binding_order():
+    import numpy as np
+    from qiskit import QuantumCircuit
+    from qiskit.circuit import Parameter
+    from quantumlib.execution.compiled_template import compile_template
+
+    a, b = Parameter('a'), Parameter('b')
+    qc = QuantumCircuit(2)
+    qc.rx(a, 0)
+    qc.rx(b, 1)
+    qc.measure_all()
+    backend = choose_backend(ibm_priority=False)
+    ab = compile_template(qc, backend, parameters=[a, b])
+    ba = compile_template(qc, backend, parameters=[b, a])
+    assert ba is not ab and ba.parameters == [b, a]
+    assert ab.run([np.pi, 0], shots=200)[0] == {'01': 200}
+    assert ba.run([np.pi, 0], shots=200)[0] == {'10': 200}
+
+def test_tensored_readout_mitigation_inverts_noise():
+    import numpy as np
+    from quantumlib.execution.error_mitigation import TensoredReadoutMitigator, readout_mitigation
+
+    A0 = np.array([[0.95, 0.10], [0.05, 0.90]])
+    A1 = np.array([[0.90, 0.05], [0.10, 0.95]])
+    true = np.array([0.5, 0.0, 0.2, 0.3])  # index = 2*q1 + q0
+    noisy = np.kron(A1, A0) @ true
+    counts = {format(i, '02b'): 1000*p for i, p in enumerate(noisy)}
+
+    mitigator = TensoredReadoutMitigator([A0, A1])
+    fixed = mitigator.apply(counts, clip=False)
+    assert np.allclose([fixed.get(format(i, '02b'), 0.0) for i in range(4)], 1000*true)
+
+    batch = readout_mitigation([counts, counts], [np.linalg.inv(A0), np.linalg.inv(A1)])
+    assert len(batch) == 2
+    assert abs(batch[1]['00'] - 500) < 1e-6
+    with pytest.raises(ValueError):
+        mitigator.apply_batch([counts, {}])
+
+def test_readout_calibrator_reuses_calibration():
+    from qiskit_aer import AerSimulator
+    from qiskit_aer.noise import NoiseModel, ReadoutError
+    from quantumlib.execution.error_mitigation import ReadoutCalibrator
+
+    noise = NoiseModel()
+    noise.add_all_qubit_readout_error(ReadoutError([[0.9, 0.1], [0.2, 0.8]]))
+    backend = AerSimulator(noise_model=noise, seed_simulator=11)
+    calibrator = ReadoutCalibrator(backend, num_qubits=2, shots=20000)
+    mitigator = calibrator.mitigator()
+    assert calibrator.mitigator() is mitigator
+    fixed = mitigator.apply({'00': 810, '01': 90, '10': 90, '11': 10})
+    assert fixed['00'] > 990
+
+def test_zero_noise_extrapolation_methods():
+    import numpy as np
+    from quantumlib.execution.error_mitigation import zero_noise_extrapolation
+
+    scales = [1, 2, 3]
+    quadratic = np.array([[1 - 0.1*s + 0.01*s**2, 0.5*np.exp(-0.2*s)] for s in scales])
+    assert np.isclose(zero_noise_extrapolation(quadratic[:, 0], scales, method='richardson'), 1.0)
+    both = zero_noise_extrapolation(quadratic, scales, method='exponential')
+    assert np.isclose(both[1], 0.5)
+    assert np.isclose(zero_noise_extrapolation([3.0, 5.0], [1, 2]), 1.0)
+
+def test_zne_executor_reduces_depolarizing_bias():
+    from qiskit import QuantumCircuit
+    from qiskit_aer import AerSimulator
+    from qiskit_aer.noise import NoiseModel, depolarizing_error
+    from quantumlib.execution.error_mitigation import ZNEExecutor, fold_circuit
+
+    noise = NoiseModel()
+    noise.add_all_qubit_quantum_error(depolarizing_error(0.02, 2), ['cx'])
+    backend = AerSimulator(noise_model=noise, seed_simulator=5)
+    qc = QuantumCircuit(2)
+    qc.h(0)
+    for _ in range(5):
+        qc.cx(0, 1)  # Bell state, <ZZ> = 1 without noise
+    assert fold_circuit(qc, 3).count_ops()['cx'] == 15
+
+    zne = ZNEExecutor(backend, scales=(1, 3, 5), method='linear', shots=20000, optimization_level=0)
+    raw = zne.expectation_values(qc, ['ZZ', 'IZ'])
+    mitigated = zne.run(qc, ['ZZ', 'IZ'])
+    assert raw.shape == (3, 2)
+    assert abs(mitigated[0] - 1) < abs(raw[0, 0] - 1)
+
+def test_backend_pool_reuses_tuned_instances():
+    from quantumlib.execution.backend_manager import get_backend, set_concurrency_limits
+
+    set_concurrency_limits(max_threads=2, max_concurrent_jobs=1)
+    try:
+        narrow = get_backend(num_qubits=3)
+        assert get_backend(num_qubits=5) is narrow
+        assert choose_backend(ibm_priority=False) is narrow
+        wide = get_backend(num_qubits=20)
+        assert wide is not narrow
+        assert narrow.options.max_parallel_threads == 2
+        assert narrow.options.max_parallel_experiments == 2
+        assert wide.options.max_parallel_experiments == 1
+    finally:
+        set_concurrency_limits()
+
+def test_concurrency_limits_reach_compiled_templates():
+    from quantumlib.circuits.vqc import VQC
+    from quantumlib.execution import compiled_template
+    from quantumlib.execution.backend_manager import get_backend, set_concurrency_limits
+
+    try:
+        set_concurrency_limits(max_threads=2)
+        before = VQC(num_qubits=2, num_layers=1).compile(get_backend())
+        set_concurrency_limits(max_threads=1)
+        assert before not in compiled_template._TEMPLATE_CACHE.values()
+        after = VQC(num_qubits=2, num_layers=1).compile(get_backend())
+        assert after.backend.options.max_parallel_threads == 1
+    finally:
+        set_concurrency_limits()
+
+def test_async_executor_merges_concurrent_requests():
+    import asyncio
+    from qiskit import QuantumCircuit
+    from quantumlib.execution.async_executor import AsyncExecutor
+
+    def bell():
+        qc = QuantumCircuit(2)
+        qc.h(0)
+        qc.cx(0, 1)
+        qc.measure_all()
+        return qc
+
+    async def scenario():
+        async with AsyncExecutor(batch_window=0.05, max_concurrency=2) as executor:
+            results = await asyncio.gather(*[executor.submit(bell(), shots=100) for _ in range(8)])
+            many = await executor.submit([bell(), bell()], shots=50)
+            return results, many, executor.jobs_submitted
+
+    results, many, jobs = asyncio.run(scenario())
+    assert all(set(c) <= {'00', '11'} and sum(c.values()) == 100 for c in results)
+    assert len(many) == 2 and sum(many[1].values()) == 50
+    assert jobs == 2, "eight concurrent requests should share one backend job"
+
+def test_async_executor_timeout():
+    import asyncio
+    import pytest
+    from qiskit import QuantumCircuit
+    from quantumlib.execution.async_executor import AsyncExecutor
+
+    qc = QuantumCircuit(1)
+    qc.measure_all()
+
+    async def scenario():
+        async with AsyncExecutor(batch_window=0.5) as executor:
+            await executor.submit(qc, timeout=0.01)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(scenario())
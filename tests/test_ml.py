@@ -0,0 +1,25 @@
+import numpy as np
+from qiskit.quantum_info import Statevector
+from quantumlib.circuits import ZZFeatureMap
+from quantumlib.execution.backend_manager import choose_backend
+from quantumlib.ml import QuantumKernel
+
+def test_kernel_matches_pairwise_overlaps(tmp_path):
+    X = np.random.default_rng(0).uniform(0, np.pi, size=(7, 3))
+    fmap = ZZFeatureMap(3)
+    states = [Statevector(fmap.construct_circuit(x)) for x in X]
+    expected = np.array([[abs(a.inner(b))**2 for b in states] for a in states])
+
+    kernel = QuantumKernel(fmap, block_size=3)
+    K = kernel.evaluate(X, out=str(tmp_path / "gram.npy"))
+    assert isinstance(K, np.memmap)
+    assert np.allclose(K, expected)
+    assert np.allclose(kernel.evaluate(X[:2], X), expected[:2])
+
+def test_shot_kernel_is_symmetric():
+    X = np.random.default_rng(1).uniform(0, np.pi, size=(4, 2))
+    kernel = QuantumKernel(ZZFeatureMap(2), backend=choose_backend(ibm_priority=False), shots=2000)
+    K = kernel.evaluate(X)
+    exact = QuantumKernel(ZZFeatureMap(2)).evaluate(X)
+    assert np.allclose(K, K.T)
+    assert np.allclose(K, exact, atol=0.08)
@@ -14,3 +14,206 @@ def test_spsa_minimize_quadratic():
     opt = SPSAOptimizer(maxiter=50, c=0.1, a=0.01)
     best_params, best_val = opt.run(cost_fn, [10.0])
     assert best_val<3, "SPSA expected to get near the minimum of 2 at x=-3"
+
+def test_gradient_engine_batches_shifted_points():
+    from quantumlib.optimizers import GradientEngine, vectorized
+    calls = []
+
+    @vectorized
+    def batch_cost(points):
+        calls.append(points.shape)
+        return np.sum(points**2, axis=1)
+
+    params = np.array([1.0, -2.0, 0.5])
+    grad = GradientEngine().gradient(batch_cost, params)
+    assert np.allclose(grad, 2*params, atol=1e-6)
+    assert calls == [(6, 3)], "all shifted points should be evaluated as one batch"
+
+    with GradientEngine(executor="thread", max_workers=4) as engine:
+        grad_pool = engine.gradient(lambda x: float(np.sum(x**2)), params)
+    assert np.allclose(grad_pool, grad)
+
+def test_spsa_batches_perturbations_and_calibrates():
+    from quantumlib.optimizers import vectorized
+    calls = []
+
+    @vectorized
+    def batch_cost(points):
+        calls.append(len(points))
+        return np.sum((points - 1.5)**2, axis=1)
+
+    opt = SPSAOptimizer(maxiter=60, c=0.1, resamplings=4, calibrate=True, target_magnitude=0.5, A=5, seed=7)
+    opt.cache = False  # repeated +/-1 perturbations would otherwise be deduplicated
+    best_params, best_val = opt.run(batch_cost, np.zeros(3))
+    assert best_val < 1e-2
+    # calibration batch, one batch per iteration (current point + 4 +/- pairs), final point
+    assert calls == [20] + [9]*60 + [1]
+
+    blocked = SPSAOptimizer(maxiter=30, a=0.05, blocking=True, seed=1)
+    params, val = blocked.run(batch_cost, np.zeros(3))
+    assert val <= np.sum(1.5**2*np.ones(3))
+
+def test_qng_uses_cached_block_diagonal_metric():
+    from qiskit.quantum_info import Statevector, SparsePauliOp
+    from quantumlib.circuits.vqc import VQC
+    from quantumlib.optimizers import QNGOptimizer
+
+    vqc = VQC(num_qubits=3, num_layers=3)
+    theta = np.random.default_rng(1).normal(size=9)*0.3
+
+    # blocks of the metric equal the per-layer blocks of the exact quantum geometric tensor
+    def state(t):
+        return Statevector(vqc.bind_parameters(t)).data
+    psi, eps = state(theta), 1e-6
+    d = [(state(theta + eps*e) - state(theta - eps*e))/(2*eps) for e in np.eye(9)]
+    qgt = np.array([[np.vdot(a, b) - np.vdot(a, psi)*np.vdot(psi, b) for b in d] for a in d]).real
+    mask = np.kron(np.eye(3), np.ones((3, 3)))
+    assert np.allclose(vqc.metric_tensor(theta), qgt*mask, atol=1e-8)
+
+    H = SparsePauliOp(["ZZI", "IZZ", "XII"], [1, 1, 0.5])
+    cost = lambda t: Statevector(vqc.bind_parameters(t)).expectation_value(H).real
+    qng = QNGOptimizer(maxiter=10, lr=0.05, metric=vqc, metric_refresh=5)
+    _, qng_val = qng.run(cost, theta)
+    _, gd_val = QNGOptimizer(maxiter=10, lr=0.05).run(cost, theta)
+    assert qng.metric_evaluations == 2
+    assert qng_val < -2.1 < gd_val
+
+def test_hybrid_keeps_state_and_switches_on_noise(caplog):
+    import logging
+    from quantumlib.optimizers import HybridOptimizer
+
+    calls = []
+    def quadratic(x):
+        calls.append(1)
+        return float(np.sum((x - 1.0)**2))
+
+    hybrid = HybridOptimizer(maxiter=40)
+    hybrid.classical.lr = 0.1
+    params, val = hybrid.run(quadratic, np.zeros(2))
+    assert val < 1e-2
+    assert [d["method"] for d in hybrid.decisions] == ["classical"]
+    assert hybrid.classical.t == 40, "Adam moments must persist across steps"
+    # 4 probes of 4 samples, 40 steps of 2n+1 points, no separate initial evaluation
+    assert len(calls) == 4*4 + 40*5 + 1
+
+    rng = np.random.default_rng(0)
+    noisy = lambda x: float(np.sum((x - 1.0)**2) + 0.01*rng.normal())
+    hybrid = HybridOptimizer(maxiter=20)
+    with caplog.at_level(logging.INFO, logger="quantumlib.optimizers.hybrid_optimizer"):
+        hybrid.run(noisy, np.zeros(2))
+    assert hybrid.decisions[0]["method"] == "quantum"
+    assert hybrid.quantum.k == 20 and hybrid.evaluations_saved == 20*2
+    assert "quantum optimizer" in caplog.text
+
+def test_ask_tell_packs_several_optimizers_into_one_batch():
+    from quantumlib.optimizers import HybridOptimizer, QNGOptimizer, RMSPropOptimizer
+
+    target = np.array([0.5, -1.0, 2.0])
+    cost = lambda points: np.sum((np.atleast_2d(points) - target)**2, axis=1)
+
+    def make():
+        return [AdamOptimizer(maxiter=30, lr=0.1), RMSPropOptimizer(maxiter=30, lr=0.05),
+                SPSAOptimizer(maxiter=30, a=0.1, seed=3, blocking=True), QNGOptimizer(maxiter=30, lr=0.2),
+                HybridOptimizer(maxiter=30)]
+
+    optimizers = make()
+    for opt in optimizers:
+        opt.start(np.zeros(3))
+    submissions = 0
+    while not all(opt.done for opt in optimizers):
+        active = [opt for opt in optimizers if not opt.done]
+        batches = [opt.ask() for opt in active]
+        values = cost(np.vstack(batches))  # one submission for every optimizer
+        submissions += 1
+        for opt, chunk in zip(active, np.split(values, np.cumsum([len(b) for b in batches])[:-1])):
+            opt.tell(chunk)
+
+    for packed, single in zip(optimizers, make()):
+        expected = single.run(lambda x: cost(x)[0], np.zeros(3))
+        assert np.allclose(packed.result()[0], expected[0]) and np.isclose(packed.result()[1], expected[1])
+    # bounded by the slowest optimizer (blocking SPSA: two batches per iteration), not by their sum
+    assert submissions <= 2*30 + 2
+
+def test_evaluation_cache_skips_repeated_points():
+    from quantumlib.optimizers import EvaluationCache, stochastic
+
+    calls = []
+    def cost(x):
+        calls.append(1)
+        return float(np.sum(x**2))
+
+    cache = EvaluationCache(cost, maxsize=2)
+    points = np.array([[1.0, 2.0], [1.0, 2.0 + 1e-13], [0.0, 1.0]])
+    assert np.allclose(cache.evaluate(points), [5.0, 5.0, 1.0])
+    assert len(calls) == 2 and cache.stats()["hits"] == 1
+    cache(np.array([3.0, 0.0]))
+    assert len(cache) == 2 and cache.evictions == 1
+    assert cache(np.array([0.0, 1.0])) == 1.0 and len(calls) == 3
+
+    # huge and non-finite points get distinct (or no) keys instead of colliding
+    identity = EvaluationCache(lambda x: float(x[0]))
+    assert np.allclose(identity.evaluate([[1e9], [2e9], [-5e9], [1e300]]), [1e9, 2e9, -5e9, 1e300])
+    assert np.isnan(identity(np.array([np.nan]))) and identity.key(np.array([np.nan])) is None
+    assert identity(np.array([np.inf])) == np.inf
+
+    # SPSA with +/-1 perturbations on one parameter revisits points; those never reach cost_fn
+    calls.clear()
+    opt = SPSAOptimizer(maxiter=40, a=0.1, resamplings=4, seed=0)
+    opt.run(cost, np.array([2.0]))
+    assert len(calls) == opt.evaluation_cache.misses < 40*9 + 1
+    assert opt.evaluation_cache.hits > 0
+
+    calls.clear()
+    opt.run(stochastic(cost), np.array([2.0]))
+    assert opt.evaluation_cache is None and len(calls) == 40*9 + 1
+
+def _multimodal(x):
+    return float(np.sum(x**2 - np.cos(3*x)))
+
+def test_multistart_successive_halving_ranks_starts():
+    from quantumlib.optimizers import multistart, initial_points
+
+    points = initial_points(8, 2, bounds=(-3, 3), seed=4)
+    factory = lambda: AdamOptimizer(lr=0.05)
+    serial = multistart(factory, points, cost_fn=_multimodal, maxiter=80, min_iterations=10, max_workers=0)
+    pooled = multistart(factory, points, cost_fn=_multimodal, maxiter=80, min_iterations=10, max_workers=2)
+
+    assert [r["start"] for r in serial] == [r["start"] for r in pooled]
+    assert np.allclose([r["value"] for r in serial], [r["value"] for r in pooled])
+    values = [r["value"] for r in serial]
+    assert values == sorted(values)
+    # rungs of 10, 20, 40, 80 iterations keep 8, 4, 2, 1 starts
+    assert sorted(r["iterations"] for r in serial) == [10]*4 + [20]*2 + [40, 80]
+    assert serial[0]["iterations"] == 80 and np.isclose(serial[0]["value"], -2.0, atol=1e-3)
+
+def test_serial_multistart_keeps_process_concurrency_limits():
+    from quantumlib.execution.backend_manager import (get_backend, get_concurrency_limits,
+                                                      set_concurrency_limits)
+    from quantumlib.optimizers import multistart
+
+    set_concurrency_limits(max_threads=8, max_concurrent_jobs=2)
+    try:
+        backend = get_backend()
+        multistart(lambda: AdamOptimizer(lr=0.05), np.zeros((2, 1)), cost_fn=_multimodal,
+                   maxiter=10, min_iterations=5, max_workers=0)
+        assert get_concurrency_limits() == {"max_threads": 8, "max_concurrent_jobs": 2}
+        assert get_backend() is backend
+    finally:
+        set_concurrency_limits()
+
+def test_hybrid_respects_sub_optimizer_cache_opt_out():
+    from quantumlib.optimizers import HybridOptimizer, vectorized
+    batches = []
+
+    @vectorized
+    def cost(points):
+        batches.append(len(points))
+        return np.sum(points**2, axis=1)
+
+    # a zero step budget switches to SPSA after the first step; its blocking
+    # reference samples must all reach cost_fn instead of being deduplicated
+    hybrid = HybridOptimizer(maxiter=3, max_step_time=0.0, noise_samples=0,
+                             quantum=SPSAOptimizer(a=0.1, blocking=True, seed=0))
+    hybrid.run(cost, np.ones(2))
+    assert hybrid.current == "quantum"
+    assert 10 in batches
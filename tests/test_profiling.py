@@ -0,0 +1,51 @@
+import numpy as np
+from quantumlib.profiling import Profiler, profiler, stage
+from quantumlib.optimizers import GradientEngine
+
+def test_disabled_profiler_records_nothing():
+    local = Profiler()
+    with local.stage("build", size=3) as s:
+        s.add(depth=2)
+    assert local.stages == {}
+
+def test_optimizer_hooks_record_cost_evaluations():
+    profiler.reset()
+    profiler.enable()
+    try:
+        cost = profiler.wrap(lambda x: float(np.sum(x**2)), "cost_fn")
+        GradientEngine().gradient(cost, np.ones(3))
+        with stage("custom") as s:
+            s.add(items=2)
+    finally:
+        profiler.disable()
+    stats = profiler.as_dict()
+    assert stats["cost_eval"]["counters"]["points"] == 6
+    assert stats["cost_fn"]["calls"] == 6
+    assert stats["custom"]["counters"]["items"] == 2
+    profiler.reset()
+
+def test_stage_stats_are_consistent_across_threads():
+    from concurrent.futures import ThreadPoolExecutor
+    local = Profiler(enabled=True)
+
+    def work(_):
+        for _ in range(200):
+            with local.stage("cost_fn") as s:
+                s.add(points=1)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(work, range(8)))
+    stats = local.as_dict()["cost_fn"]
+    assert stats["calls"] == 1600 and stats["counters"]["points"] == 1600
+
+def test_template_compile_skips_counters_when_disabled(monkeypatch):
+    from qiskit import QuantumCircuit
+    from quantumlib.execution.backend_manager import choose_backend
+    from quantumlib.execution.compiled_template import CompiledTemplate
+
+    def fail(self, *args, **kwargs):
+        raise AssertionError("depth() computed with profiling disabled")
+    monkeypatch.setattr(QuantumCircuit, "depth", fail)
+    qc = QuantumCircuit(1)
+    qc.h(0)
+    CompiledTemplate(qc, choose_backend(ibm_priority=False), optimization_level=0)